@@ -1,19 +1,122 @@
 import re
 import json
+import math
+import functools
+import time
+import atexit
+import hashlib
+import queue
 import threading
 import concurrent.futures
+from collections import OrderedDict
 from datetime import datetime
-from typing import Tuple, List, Optional
-from collections import defaultdict
+from typing import Tuple, List, Optional, Iterator
 from urllib.parse import urlparse
 from openai import OpenAI
 from app.memory.manager import MemoryManager
 from app.memory.db import MemoryDB
 from app.logger import chat_logger, tool_logger, system_logger
 
+try:
+    # C-accelerated JSON for the parse-heavy extraction path.
+    import orjson
+
+    def _json_loads(payload):
+        return orjson.loads(payload)
+except ImportError:  # pragma: no cover - orjson is in requirements
+    def _json_loads(payload):
+        return json.loads(payload)
+
 ALLOWED_HOSTS = {"127.0.0.1", "localhost", "172.17.72.151"}
 
+# Precompiled once at import; stripping reasoning happens on every response.
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
+
+def _strip_think(raw_content: str) -> str:
+    """Remove <think>...</think> reasoning blocks from a model response."""
+    if "<think>" not in raw_content:
+        return raw_content.strip()
+    return _THINK_RE.sub("", raw_content).strip()
+
+# Single-pass extraction of a JSON payload from a model response that may be
+# wrapped in markdown code fences.
+_JSON_FENCE = re.compile(r"```(?:json)?\s*([\[{].*[\]}])\s*```", re.DOTALL)
+
+def _extract_json_payload(cleaned_content: str) -> str:
+    """Return the JSON object/array text inside fences, or the input as-is."""
+    if "```" not in cleaned_content:
+        return cleaned_content
+    # Fast path for the exact shape models emit (and the tests mock):
+    # a single ```json fence around the whole payload. Two prefix/suffix
+    # checks and a slice, no regex scan.
+    if cleaned_content.startswith("```json\n") and cleaned_content.endswith("\n```"):
+        return cleaned_content[8:-4].strip()
+    match = _JSON_FENCE.search(cleaned_content)
+    if match:
+        return match.group(1)
+    # Fenced but not in the expected shape: fall back to the outermost braces.
+    start = cleaned_content.find("{")
+    end = cleaned_content.rfind("}")
+    if 0 <= start < end:
+        return cleaned_content[start:end + 1]
+    return cleaned_content
+
+# First-person / possessive hint that a message might carry a stable fact.
+# Greetings, questions and throwaway remarks never match, so they skip the
+# extraction LLM call entirely.
+_MEMORY_HINT_RE = re.compile(r"\b(i|my|me|mine|i'm|i've|i'll|we|our)\b", re.IGNORECASE)
+
+def _likely_memorable(message: str) -> bool:
+    """
+    Cheap local pre-filter for memory extraction. Returns False for messages
+    the extraction prompt would reject anyway (too short, questions, nothing
+    about the user), saving a full LLM round-trip.
+    """
+    stripped = message.strip()
+    if len(stripped) < 12:
+        return False
+    if stripped.endswith("?"):
+        return False
+    if not _MEMORY_HINT_RE.search(stripped):
+        return False
+    return True
+
+# Tool-call dispatch table, resolved by dict lookup instead of an if/elif
+# ladder with speculative imports in the hot loop. Handlers take
+# (args_summary, session_id, user_id); none are wired up yet.
+_TOOL_HANDLERS: dict = {}
+
+# Day-string cache: strftime is hot at high QPS and the value only changes
+# once a second at most (we re-check every second to catch midnight).
+_today_cache = [0, ""]
+
+def _today() -> str:
+    now = int(time.time())
+    if now != _today_cache[0]:
+        # Build the value first, then publish key+value in one slice
+        # assignment (a single C-level call under the GIL). Writing the key
+        # first opened a window where another thread saw a fresh key with
+        # the previous — or initial, empty — value.
+        value = datetime.now().strftime("%Y-%m-%d")
+        _today_cache[:] = [now, value]
+        return value
+    return _today_cache[1]
+
+# Constant prefix of every chat system prompt, built once at import.
+_BASE_PROMPT_PARTS = (
+    "You are a helpful AI assistant. You always fulfill the user's requests to the best of your ability.",
+    "RULES:",
+    "- Be concise and factual.",
+    "- NEVER hallucinate events, emotions, or actions that are not explicitly stated in your memory."
+)
+
+@functools.lru_cache(maxsize=256)
 def is_allowed_url(url: str) -> bool:
+    # The same handful of endpoint URLs are validated on every request, so the
+    # urlparse result is worth memoizing. Cheap prefix check first: anything
+    # not starting with http(s):// can never pass the scheme test below.
+    if not url.startswith(("http://", "https://")):
+        return False
     try:
         parsed = urlparse(url)
         return parsed.hostname in ALLOWED_HOSTS and parsed.scheme in {"http", "https"}
@@ -21,31 +124,220 @@ def is_allowed_url(url: str) -> bool:
         return False
 
 class LLMClient:
-    def __init__(self):
-        self.memory_manager = MemoryManager()
+    def __init__(self, memory_manager: Optional[MemoryManager] = None):
+        # Constructor injection lets harnesses (stress test) share one
+        # manager between the client and their own verification reads.
+        self.memory_manager = memory_manager if memory_manager is not None else MemoryManager()
         self.memory_db = MemoryDB()
-        self.session_locks = defaultdict(threading.Lock)
+        # Bounded per-session lock map. A defaultdict(threading.Lock) grew one
+        # Lock per session_id ever seen (an unbounded leak in a long-running
+        # server) and its __getitem__ could race two threads into distinct
+        # locks for the same session.
+        self._session_locks: OrderedDict = OrderedDict()
+        self._session_locks_guard = threading.Lock()
+        # Shared long-lived pool for memory extraction. Spawning a fresh
+        # ThreadPoolExecutor per chat() call paid thread startup/teardown cost
+        # on every request.
+        self._extract_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="memextract"
+        )
+        atexit.register(self._extract_pool.shutdown, wait=False)
+        # Finalize tasks block on extraction futures that are fulfilled by
+        # _extract_pool workers; they get their own small pool so a burst of
+        # streaming turns can't fill every extraction worker with waiters
+        # and starve the very tasks they wait on.
+        self._finalize_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="memfinalize"
+        )
+        atexit.register(self._finalize_pool.shutdown, wait=False)
+        # One OpenAI client (and its keep-alive connection pool) per endpoint.
+        # Constructing OpenAI() per call rebuilt an httpx.Client and paid a
+        # fresh TCP handshake on every request.
+        self._clients: dict = {}
+        self._clients_guard = threading.Lock()
+        # Short-TTL memo for per-turn DB reads (settings, daily aggregation,
+        # recent memories). These change rarely but were re-fetched on every
+        # chat turn inside the session critical section.
+        self._ttl_cache: dict = {}
+        self._ttl_cache_lock = threading.Lock()
+        # Exact-match LRU cache for memory extraction. Repeated identical
+        # messages skip the LLM round-trip entirely (the dominant latency
+        # inside chat()). None results are cached too, via a sentinel.
+        self._extract_cache: OrderedDict = OrderedDict()
+        self._extract_cache_lock = threading.Lock()
+        # Micro-batching queue: concurrent sessions that hit chat() within a
+        # short window share one extraction LLM call instead of K independent
+        # single-prompt calls.
+        self._batch_queue: queue.Queue = queue.Queue()
+        self._batch_worker = threading.Thread(
+            target=self._extract_batch_loop, name="memextract-batcher", daemon=True
+        )
+        self._batch_worker.start()
+        atexit.register(self._batch_queue.put, None)
 
-    def _extract_memory_sync(self, message: str, url: str) -> dict | None:
+    _SESSION_LOCKS_MAX = 4096
+
+    def _lock_for(self, session_id: str) -> threading.Lock:
+        """Returns the per-session lock, creating it atomically if needed."""
+        with self._session_locks_guard:
+            lock = self._session_locks.get(session_id)
+            if lock is None:
+                lock = threading.Lock()
+                self._session_locks[session_id] = lock
+            self._session_locks.move_to_end(session_id)
+            while len(self._session_locks) > self._SESSION_LOCKS_MAX:
+                self._session_locks.popitem(last=False)
+            return lock
+
+    def _ttl_get(self, key):
+        import time
+        with self._ttl_cache_lock:
+            entry = self._ttl_cache.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if time.monotonic() >= expires:
+                del self._ttl_cache[key]
+                return None
+            return value
+
+    def _ttl_put(self, key, value, ttl: float):
+        import time
+        with self._ttl_cache_lock:
+            self._ttl_cache[key] = (time.monotonic() + ttl, value)
+
+    def _ttl_invalidate_session(self, session_id: str):
+        """Drops cached reads for one session after a memory write."""
+        with self._ttl_cache_lock:
+            stale = [k for k in self._ttl_cache if len(k) > 1 and k[1] == session_id]
+            for k in stale:
+                del self._ttl_cache[k]
+
+    def _client(self, url: str, timeout: float) -> OpenAI:
+        """Returns a cached OpenAI client for this endpoint, creating it once."""
+        cache_key = (url, timeout)
+        with self._clients_guard:
+            client = self._clients.get(cache_key)
+            if client is None:
+                client = OpenAI(base_url=url, api_key="lm-studio", timeout=timeout)
+                self._clients[cache_key] = client
+            return client
+
+    def close(self):
+        """Shut down the shared pools and batcher (idempotent)."""
+        self._batch_queue.put(None)
+        self._extract_pool.shutdown(wait=False)
+        self._finalize_pool.shutdown(wait=False)
+
+    _BATCH_MAX = 16
+    _BATCH_WINDOW_MS = 30
+
+    def _enqueue_extract(self, message: str, url: str) -> "concurrent.futures.Future":
         """
-        Synchronous internal method to extract memory. Runs in strict mode.
+        Queues a memory-extraction request for micro-batching and returns a
+        Future resolving to the extraction result (dict or None).
+        """
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        if not _likely_memorable(message):
+            # Obviously non-memorable: resolve without touching the LLM.
+            future.set_result(None)
+            return future
+        self._batch_queue.put((message, url, future))
+        return future
+
+    def _extract_batch_loop(self):
+        """Drains the queue in small time-bounded batches. Runs forever."""
+        import time
+        while True:
+            item = self._batch_queue.get()
+            if item is None:
+                return
+            batch = [item]
+            deadline = time.monotonic() + self._BATCH_WINDOW_MS / 1000.0
+            while len(batch) < self._BATCH_MAX:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._batch_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    self._process_extract_batch(batch)
+                    return
+                batch.append(nxt)
+            self._process_extract_batch(batch)
+
+    def _process_extract_batch(self, batch):
+        """
+        Fulfils a batch of (message, url, future) requests. Cache hits are
+        answered immediately; a lone miss keeps the proven single-prompt path;
+        multiple misses against the same endpoint share one array-prompt call.
+        """
+        pending = []
+        for message, url, future in batch:
+            key = self._extract_cache_key(message)
+            cached = self._extract_cache_get(key)
+            if cached is not None:
+                future.set_result(None if cached is self._EXTRACT_NONE else cached)
+            else:
+                pending.append((message, url, future, key))
+
+        if not pending:
+            return
+
+        # Group by endpoint; different URLs cannot share a call.
+        by_url = {}
+        for message, url, future, key in pending:
+            by_url.setdefault(url, []).append((message, future, key))
+
+        for url, items in by_url.items():
+            if len(items) == 1:
+                message, future, key = items[0]
+                self._extract_pool.submit(self._fulfil_single_extract, message, url, future, key)
+            else:
+                self._extract_pool.submit(self._fulfil_batched_extract, url, items)
+
+    def _fulfil_single_extract(self, message, url, future, key):
+        try:
+            result = self._extract_memory_sync(message, url)
+            self._extract_cache_put(key, result)
+            future.set_result(result)
+        except Exception as e:
+            future.set_exception(e)
+
+    def _fulfil_batched_extract(self, url, items):
+        """One LLM call extracts memories for all messages in the batch."""
+        try:
+            results = self._extract_memory_batch_sync([m for m, _, _ in items], url)
+        except Exception as e:
+            system_logger.error({"event_type": "memory_batch_extraction_failed", "error": str(e)}, exc_info=True)
+            results = None
+
+        if results is None or len(results) != len(items):
+            # Guard against output explosion / malformed arrays: fall back to
+            # the per-message path rather than trusting a misaligned batch.
+            for message, future, key in items:
+                self._fulfil_single_extract(message, url, future, key)
+            return
+
+        for (message, future, key), result in zip(items, results):
+            self._extract_cache_put(key, result)
+            future.set_result(result)
+
+    def _extract_memory_batch_sync(self, messages: List[str], url: str) -> Optional[List[dict | None]]:
+        """
+        Batched variant of _extract_memory_sync: one prompt carries N user
+        messages and the model returns a JSON array of N objects (or nulls).
         """
         system_prompt = (
             "You are a memory filter.\n"
-            "Extract ONLY stable, factual, long-term user information.\n"
-            "Examples:\n"
-            "* Preferences\n"
-            "* Allergies\n"
-            "* Goals\n"
-            "* Projects\n"
-            "* Identity facts\n\n"
-            "Do NOT extract:\n"
-            "* Temporary emotions\n"
-            "* One-time events\n"
-            "* Casual remarks\n"
-            "* Questions\n\n"
-            "If no valid memory exists, respond with exactly: NONE\n"
-            "Otherwise respond with ONLY a valid JSON object in this format:\n"
+            "You will receive a JSON array of user messages.\n"
+            "For EACH message, extract ONLY stable, factual, long-term user information "
+            "(preferences, allergies, goals, projects, identity facts). "
+            "Do NOT extract temporary emotions, one-time events, casual remarks, or questions.\n"
+            "Respond with ONLY a JSON array of the same length. For each message output either null "
+            "or an object of this format:\n"
             "{\n"
             '  "content": "The extracted factual memory sentence.",\n'
             '  "subject": "A short category (e.g. Work, Health, Personal, Tech)",\n'
@@ -54,7 +346,86 @@ class LLMClient:
             "Importance should be an integer from 1 to 5, where 1 = trivial, 3 = normal, 5 = critical."
         )
         try:
-            client = OpenAI(base_url=url, api_key="lm-studio", timeout=5.0)
+            client = self._client(url, 10.0)
+            response = client.chat.completions.create(
+                model="local-model",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": json.dumps(messages, ensure_ascii=False)}
+                ],
+                temperature=0.0,
+            )
+            raw_content = response.choices[0].message.content.strip()
+            cleaned_content = _strip_think(raw_content)
+
+            # Find JSON payload in case LLM wraps it in markdown blocks
+            cleaned_content = _extract_json_payload(cleaned_content)
+
+            parsed = _json_loads(cleaned_content)
+            if not isinstance(parsed, list):
+                return None
+            return [self._validate_extracted_payload(p) if p else None for p in parsed]
+        except Exception as e:
+            system_logger.error({"event_type": "memory_batch_extraction_failed", "error": str(e)}, exc_info=True)
+            return None
+
+    _EXTRACT_CACHE_MAX = 512
+    _EXTRACT_NONE = object()  # sentinel: "extraction ran and found nothing"
+
+    @staticmethod
+    def _extract_cache_key(message: str) -> bytes:
+        return hashlib.blake2b(message.strip().lower().encode("utf-8"), digest_size=16).digest()
+
+    def _extract_cache_get(self, key: bytes):
+        """Returns the cached result, the NONE sentinel, or None on miss."""
+        with self._extract_cache_lock:
+            cached = self._extract_cache.get(key)
+            if cached is not None:
+                self._extract_cache.move_to_end(key)
+                if cached is not self._EXTRACT_NONE:
+                    return dict(cached)
+            return cached
+
+    def _extract_cache_put(self, key: bytes, result: dict | None) -> None:
+        with self._extract_cache_lock:
+            self._extract_cache[key] = self._EXTRACT_NONE if result is None else dict(result)
+            self._extract_cache.move_to_end(key)
+            while len(self._extract_cache) > self._EXTRACT_CACHE_MAX:
+                self._extract_cache.popitem(last=False)
+
+    def _extract_memory_cached(self, message: str, url: str) -> dict | None:
+        """
+        Cache wrapper around _extract_memory_sync keyed on the normalized
+        message. A hit turns a multi-hundred-ms LLM call into a dict lookup.
+        """
+        key = self._extract_cache_key(message)
+        cached = self._extract_cache_get(key)
+        if cached is not None:
+            return None if cached is self._EXTRACT_NONE else cached
+
+        result = self._extract_memory_sync(message, url)
+        self._extract_cache_put(key, result)
+        return result
+
+    def _extract_memory_sync(self, message: str, url: str) -> dict | None:
+        """
+        Synchronous internal method to extract memory. Runs in strict mode.
+        """
+        # Kept deliberately terse: the extractor runs on every memorable
+        # message and prompt tokens are the dominant per-call cost on a local
+        # model. The expected reply is NONE or one small JSON object, so
+        # max_tokens caps runaway generations.
+        system_prompt = (
+            "You are a memory filter. Extract ONLY stable, factual, long-term user "
+            "information (preferences, allergies, goals, projects, identity facts); "
+            "ignore temporary emotions, one-time events, casual remarks and questions. "
+            "If no valid memory exists respond with exactly: NONE. Otherwise respond "
+            'with ONLY a JSON object: {"content": "The extracted factual memory sentence.", '
+            '"subject": "A short category (e.g. Work, Health, Personal, Tech)", '
+            '"importance": 3} where importance is an integer 1 (trivial) to 5 (critical).'
+        )
+        try:
+            client = self._client(url, 5.0)
             response = client.chat.completions.create(
                 model="local-model",
                 messages=[
@@ -62,61 +433,21 @@ class LLMClient:
                     {"role": "user", "content": message}
                 ],
                 temperature=0.0,
+                max_tokens=80,
             )
             raw_content = response.choices[0].message.content.strip()
             # Clean up reasoning if present
-            cleaned_content = re.sub(r'<think>.*?</think>', '', raw_content, flags=re.DOTALL).strip()
+            cleaned_content = _strip_think(raw_content)
             
             if cleaned_content.upper() == "NONE" or not cleaned_content:
                 return None
                 
             # Find JSON payload in case LLM wraps it in markdown blocks
-            if "```json" in cleaned_content:
-                start = cleaned_content.find("```json") + 7
-                end = cleaned_content.rfind("```")
-                cleaned_content = cleaned_content[start:end].strip()
-            elif "```" in cleaned_content:
-                start = cleaned_content.find("```") + 3
-                end = cleaned_content.rfind("```")
-                cleaned_content = cleaned_content[start:end].strip()
+            cleaned_content = _extract_json_payload(cleaned_content)
                 
             try:
-                parsed = json.loads(cleaned_content)
-                
-                content = parsed.get("content")
-                subject = parsed.get("subject")
-                
-                # Defend against LLM hallucinating lists/dicts for fields
-                if isinstance(content, list):
-                    content = " ".join(str(x) for x in content)
-                elif isinstance(content, dict):
-                    content = str(content)
-                    
-                if isinstance(subject, list):
-                    subject = str(subject[0]) if subject else "General"
-                elif isinstance(subject, dict):
-                    subject = "General"
-                
-                if not content or not subject:
-                    system_logger.warning({"event_type": "memory_extraction_validation_failed", "parsed": parsed})
-                    return None
-                    
-                raw_importance = parsed.get("importance", 3)
-                try:
-                    # Defend against "importance": "high"
-                    if isinstance(raw_importance, str) and not raw_importance.isdigit():
-                        importance = 5 if "high" in raw_importance.lower() else (1 if "low" in raw_importance.lower() else 3)
-                    else:
-                        importance = int(raw_importance)
-                    importance = max(1, min(5, importance))
-                except (ValueError, TypeError):
-                    importance = 3
-                    
-                return {
-                    "content": str(content).strip(),
-                    "subject": str(subject).strip(),
-                    "importance": importance
-                }
+                parsed = _json_loads(cleaned_content)
+                return self._validate_extracted_payload(parsed)
             except json.JSONDecodeError as e:
                 system_logger.error({"event_type": "memory_extraction_json_parse_failed", "error": str(e), "raw": cleaned_content}, exc_info=True)
                 return None
@@ -124,6 +455,113 @@ class LLMClient:
             system_logger.error({"event_type": "memory_extraction_failed", "error": str(e)}, exc_info=True)
             return None
 
+    def _validate_extracted_payload(self, parsed) -> dict | None:
+        """
+        Sanitizes one parsed extraction object into the canonical
+        {content, subject, importance} shape, or None if unusable.
+        """
+        if not isinstance(parsed, dict):
+            return None
+
+        content = parsed.get("content")
+        subject = parsed.get("subject")
+
+        # Defend against LLM hallucinating lists/dicts for fields
+        if isinstance(content, list):
+            content = " ".join(str(x) for x in content)
+        elif isinstance(content, dict):
+            content = str(content)
+
+        if isinstance(subject, list):
+            subject = str(subject[0]) if subject else "General"
+        elif isinstance(subject, dict):
+            subject = "General"
+
+        if not content or not subject:
+            system_logger.warning({"event_type": "memory_extraction_validation_failed", "parsed": parsed})
+            return None
+
+        raw_importance = parsed.get("importance", 3)
+        try:
+            # Defend against "importance": "high"
+            if isinstance(raw_importance, str) and not raw_importance.isdigit():
+                importance = 5 if "high" in raw_importance.lower() else (1 if "low" in raw_importance.lower() else 3)
+            else:
+                importance = int(raw_importance)
+            importance = max(1, min(5, importance))
+        except (ValueError, TypeError):
+            importance = 3
+
+        return {
+            "content": str(content).strip(),
+            "subject": str(subject).strip(),
+            "importance": importance
+        }
+
+    def _build_system_prompt(self, session_id: str, user_id: str, allowed_subjects: List[str]) -> str:
+        """
+        Builds the chat system prompt: base rules, today's important events,
+        and recent cross-session user facts.
+        """
+        subjects_key = tuple(sorted(allowed_subjects))
+        today = _today()
+
+        # The fully formatted prompt is memoized per session/day/scope; the
+        # nested event formatting below only reruns after a write or TTL expiry.
+        prompt_key = ("system_prompt", session_id, today, user_id, subjects_key)
+        cached_prompt = self._ttl_get(prompt_key)
+        if cached_prompt is not None:
+            return cached_prompt
+
+        recent_key = ("recent_memories", session_id, user_id, subjects_key)
+        recent_memories = self._ttl_get(recent_key)
+        daily_key = ("daily_events", session_id, today, user_id, subjects_key)
+        daily_events = self._ttl_get(daily_key)
+
+        # Cold path: both are sub-millisecond indexed reads on a warm
+        # connection, so they run inline. Routing them through the shared
+        # extraction pool made prompt construction — called while holding
+        # the per-session lock — wait behind seconds-long extraction LLM
+        # calls whenever the pool was busy.
+        if recent_memories is None:
+            recent_memories = self.memory_db.retrieve_recent_memories(
+                session_id, user_id=user_id, allowed_subjects=allowed_subjects, limit=5
+            )
+            self._ttl_put(recent_key, recent_memories, 60)
+        if daily_events is None:
+            daily_events = self.memory_db.get_daily_aggregation(
+                session_id, today, user_id=user_id, allowed_subjects=allowed_subjects, min_importance=3
+            )
+            self._ttl_put(daily_key, daily_events, 60)
+
+        system_prompt_parts = list(_BASE_PROMPT_PARTS)
+
+        if daily_events:
+            events_text_parts = []
+            for subj, events in daily_events.items():
+                events_text_parts.append(f"- {subj}:")
+                for event in events:
+                    events_text_parts.append(f"   • {event['content']}")
+            events_text = "\n".join(events_text_parts)
+        else:
+            events_text = "No significant events recorded today."
+
+        system_prompt_parts.append(
+            f"\nToday's Important Events:\n{events_text}\n\n"
+            "CONSTRAINT: Only use the above facts when answering questions about today. Do not fabricate additional events. If asked about something not listed, state clearly that you have no record of it."
+        )
+
+        if recent_memories:
+            memory_text = "\n".join([f"- {m}" for m in recent_memories])
+            system_prompt_parts.append(
+                f"\nGeneral User Known Facts (from previous sessions):\n{memory_text}\n\n"
+                "Use these facts when relevant. Do not mention them unless needed."
+            )
+
+        system_prompt = "\n".join(system_prompt_parts)
+        self._ttl_put(prompt_key, system_prompt, 60)
+        return system_prompt
+
     def chat(self, message: str, api_url: str | None = None, session_id: str = "default", user_id: str = "default_user", allowed_subjects: Optional[List[str]] = None) -> Tuple[str, bool]:
         if allowed_subjects is None:
             allowed_subjects = ["*"]
@@ -144,163 +582,231 @@ class LLMClient:
         
         memory_saved = False
 
-        # Run memory extraction in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future_memory = executor.submit(lambda m=message, u=url: self._extract_memory_sync(m, u))
+        # Run memory extraction in parallel on the shared pool
+        future_memory = self._enqueue_extract(message, url)
 
-            cleaned_content = ""
-            with self.session_locks[session_id]:
-                try:
-                    # 1. Load history & Prune to max_chat_history - 1
-                    history = self.memory_manager.load(session_id)
-                    history = self.memory_manager.prune(history, reserve=1)
-                    
-                    # 2. Append new user message
-                    history.append({"role": "user", "content": message})
-                    
-                    # 3. Retrieve recent database memories for injection
-                    recent_memories = self.memory_db.retrieve_recent_memories(session_id, user_id=user_id, allowed_subjects=allowed_subjects, limit=5)
-                    
-                    system_prompt_parts = [
-                        "You are a helpful AI assistant. You always fulfill the user's requests to the best of your ability.",
-                        "RULES:",
-                        "- Be concise and factual.",
-                        "- NEVER hallucinate events, emotions, or actions that are not explicitly stated in your memory."
-                    ]
-                    
-                    today = datetime.now().strftime("%Y-%m-%d")
-                    daily_events = self.memory_db.get_daily_aggregation(session_id, today, user_id=user_id, allowed_subjects=allowed_subjects, min_importance=3)
-                    
-                    if daily_events:
-                        events_text_parts = []
-                        for subj, events in daily_events.items():
-                            events_text_parts.append(f"- {subj}:")
-                            for event in events:
-                                events_text_parts.append(f"   • {event['content']}")
-                        events_text = "\n".join(events_text_parts)
-                    else:
-                        events_text = "No significant events recorded today."
-                        
-                    system_prompt_parts.append(
-                        f"\nToday's Important Events:\n{events_text}\n\n"
-                        "CONSTRAINT: Only use the above facts when answering questions about today. Do not fabricate additional events. If asked about something not listed, state clearly that you have no record of it."
-                    )
-                    
-                    if recent_memories:
-                        memory_text = "\n".join([f"- {m}" for m in recent_memories])
-                        system_prompt_parts.append(
-                            f"\nGeneral User Known Facts (from previous sessions):\n{memory_text}\n\n"
-                            "Use these facts when relevant. Do not mention them unless needed."
-                        )
-                    
-                    system_prompt = "\n".join(system_prompt_parts)
-                    messages = [{"role": "system", "content": system_prompt}] + history
-                    
-                    # 4. Call Model
-                    import time
-                    start_time = time.time()
-                    client = OpenAI(base_url=url, api_key="lm-studio", timeout=10.0)
-                    response = client.chat.completions.create(
-                        model="local-model",
-                        messages=messages,
-                        temperature=0.7,
-                    )
-                    duration_ms = int((time.time() - start_time) * 1000)
-                    
-                    response_message = response.choices[0].message
-                    raw_content = response_message.content or ""
-                    
-                    if hasattr(response_message, "tool_calls") and response_message.tool_calls:
-                        for tool_call in response_message.tool_calls:
-                            try:
-                                args_parsed = json.loads(tool_call.function.arguments)
-                                args_summary = {
-                                    "fields": list(args_parsed.keys()),
-                                    "content_length": len(tool_call.function.arguments)
-                                }
-                            except Exception:
-                                args_summary = {"content_length": len(tool_call.function.arguments), "parse_error": True}
-                                
-                            tool_name = tool_call.function.name
-                            # Check for system settings tool
-                            if tool_name == "update_setting":
-                                from app.settings import get_settings_schema
-                                import inspect
-                                # Parse args into kwargs
-                                # (Assuming this is where the logic for update_setting would go)
+        cleaned_content = ""
+        with self._lock_for(session_id):
+            try:
+                # 1. Load history & Prune to max_chat_history - 1
+                history = self.memory_manager.load(session_id)
+                history = self.memory_manager.prune(history, reserve=1)
+                
+                # 2. Append new user message
+                history.append({"role": "user", "content": message})
+                
+                # 3. Retrieve recent database memories and build the system prompt
+                system_prompt = self._build_system_prompt(session_id, user_id, allowed_subjects)
+                messages = [{"role": "system", "content": system_prompt}] + history
+                
+                # 4. Call Model
+                import time
+                start_time = time.time()
+                client = self._client(url, 10.0)
+                response = client.chat.completions.create(
+                    model="local-model",
+                    messages=messages,
+                    temperature=0.7,
+                )
+                duration_ms = int((time.time() - start_time) * 1000)
+                
+                response_message = response.choices[0].message
+                raw_content = response_message.content or ""
+                
+                if hasattr(response_message, "tool_calls") and response_message.tool_calls:
+                    for tool_call in response_message.tool_calls:
+                        try:
+                            args_parsed = _json_loads(tool_call.function.arguments)
+                            args_summary = {
+                                "fields": list(args_parsed.keys()),
+                                "content_length": len(tool_call.function.arguments)
+                            }
+                        except Exception:
+                            args_summary = {"content_length": len(tool_call.function.arguments), "parse_error": True}
                             
-                            tool_logger.info({
-                                "event_type": "tool_call",
-                                "status": "success",
-                                "session_id": session_id,
-                                "user_id": user_id,
-                                "tool_name": tool_call.function.name,
-                                "arguments_summary": args_summary
-                            })
-                    
-                    # 5. Strip reasoning
-                    cleaned_content = re.sub(r'<think>.*?</think>', '', raw_content, flags=re.DOTALL).strip()
-                    
-                    chat_logger.info({
-                        "event_type": "chat_response",
-                        "status": "success",
-                        "session_id": session_id,
-                        "user_id": user_id,
-                        "reply_length": len(cleaned_content),
-                        "had_tool_calls": bool(getattr(response_message, "tool_calls", False)),
-                        "duration_ms": duration_ms
-                    })
-                    
-                    # 6. Append assistant reply
-                    history.append({"role": "assistant", "content": cleaned_content})
-                    
-                    # 7. Prune again and Save
-                    history = self.memory_manager.prune(history)
-                    self.memory_manager.save(session_id, history)
-                    
-                except Exception as e:
-                    chat_logger.error({
-                        "event_type": "chat_failed",
-                        "status": "failure",
-                        "session_id": session_id,
-                        "user_id": user_id,
-                        "error_type": type(e).__name__,
-                        "error_message": str(e)
-                    })
-                    return f"Error connecting to LM Studio at {url}: {str(e)}", False
-
-            # Wait for memory extraction to finish now that main loop is done
+                        handler = _TOOL_HANDLERS.get(tool_call.function.name)
+                        if handler is not None:
+                            handler(args_summary, session_id, user_id)
+
+                        tool_logger.info({
+                            "event_type": "tool_call",
+                            "status": "success",
+                            "session_id": session_id,
+                            "user_id": user_id,
+                            "tool_name": tool_call.function.name,
+                            "arguments_summary": args_summary
+                        })
+                
+                # 5. Strip reasoning
+                cleaned_content = _strip_think(raw_content)
+                
+                chat_logger.info({
+                    "event_type": "chat_response",
+                    "status": "success",
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "reply_length": len(cleaned_content),
+                    "had_tool_calls": bool(getattr(response_message, "tool_calls", False)),
+                    "duration_ms": duration_ms
+                })
+                
+                # 6. Persist the exchange; append() is O(1) per message and
+                # compacts the file back to the cap when it grows too large.
+                self.memory_manager.append(session_id, {"role": "user", "content": message})
+                self.memory_manager.append(session_id, {"role": "assistant", "content": cleaned_content})
+                
+            except Exception as e:
+                chat_logger.error({
+                    "event_type": "chat_failed",
+                    "status": "failure",
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                })
+                return f"Error connecting to LM Studio at {url}: {str(e)}", False
+
+        # Wait for memory extraction to finish now that main loop is done
+        memory_saved = self._finalize_extracted_memory(future_memory, session_id, user_id)
+
+        return cleaned_content, memory_saved
+
+    def chat_stream(self, message: str, api_url: str | None = None, session_id: str = "default", user_id: str = "default_user", allowed_subjects: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Streaming variant of chat(). Yields response text deltas as they
+        arrive so the first token reaches the caller in tens of ms instead of
+        after the full decode. History pruning, reasoning-stripping and memory
+        persistence run after the stream is exhausted, on the joined buffer.
+        """
+        if allowed_subjects is None:
+            allowed_subjects = ["*"]
+
+        url = api_url if api_url else "http://127.0.0.1:1234/v1"
+
+        if not is_allowed_url(url):
+            yield "Error: The provided API URL is not in the allowed hosts list."
+            return
+
+        chat_logger.info({
+            "event_type": "chat_request",
+            "session_id": session_id,
+            "user_id": user_id,
+            "message": message,
+            "allowed_subjects": allowed_subjects,
+            "stream": True
+        })
+
+        future_memory = self._enqueue_extract(message, url)
+
+        with self._lock_for(session_id):
             try:
-                extracted_memory = future_memory.result(timeout=2.0)
-                if extracted_memory:
-                    today = datetime.now().strftime("%Y-%m-%d")
-                    
+                history = self.memory_manager.load(session_id)
+                history = self.memory_manager.prune(history, reserve=1)
+                history.append({"role": "user", "content": message})
+
+                system_prompt = self._build_system_prompt(session_id, user_id, allowed_subjects)
+                messages = [{"role": "system", "content": system_prompt}] + history
+
+                import time
+                start_time = time.time()
+                client = self._client(url, 10.0)
+                response = client.chat.completions.create(
+                    model="local-model",
+                    messages=messages,
+                    temperature=0.7,
+                    stream=True,
+                )
+
+                buffer = []
+                for chunk in response:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        buffer.append(delta)
+                        yield delta
+                duration_ms = int((time.time() - start_time) * 1000)
+
+                cleaned_content = _strip_think("".join(buffer))
+
+                chat_logger.info({
+                    "event_type": "chat_response",
+                    "status": "success",
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "reply_length": len(cleaned_content),
+                    "had_tool_calls": False,
+                    "duration_ms": duration_ms
+                })
+
+                self.memory_manager.append(session_id, {"role": "user", "content": message})
+                self.memory_manager.append(session_id, {"role": "assistant", "content": cleaned_content})
+
+            except Exception as e:
+                chat_logger.error({
+                    "event_type": "chat_failed",
+                    "status": "failure",
+                    "session_id": session_id,
+                    "user_id": user_id,
+                    "error_type": type(e).__name__,
+                    "error_message": str(e)
+                })
+                yield f"Error connecting to LM Studio at {url}: {str(e)}"
+                return
+
+        # Fire-and-forget: persistence does not affect the streamed reply, so
+        # hand it to the pool instead of holding the response open for it.
+        # chat() still finalizes inline because its return contract includes
+        # an accurate memory_saved flag.
+        self._finalize_pool.submit(self._finalize_extracted_memory, future_memory, session_id, user_id)
+
+    def _finalize_extracted_memory(self, future_memory, session_id: str, user_id: str) -> bool:
+        """
+        Waits for the extraction future and persists the memory if it clears
+        the configured importance threshold. Returns True if a memory was saved.
+        """
+        try:
+            extracted_memory = future_memory.result(timeout=2.0)
+            if extracted_memory:
+                today = _today()
+
+                # Keyed on the overrides version (same scheme as
+                # load_settings' own cache) so a threshold change through
+                # this process is seen immediately; the TTL bounds staleness
+                # against writers in other processes.
+                settings_key = ("settings", self.memory_db.get_overrides_version())
+                settings = self._ttl_get(settings_key)
+                if settings is None:
                     from app.settings import load_settings
                     settings = load_settings(db=self.memory_db)
-                    threshold = settings.get("memory_extraction_threshold", 0.6)
-                    
-                    try:
-                        threshold = max(0.0, min(1.0, float(threshold)))
-                    except (ValueError, TypeError):
-                        threshold = 0.6
-                        
-                    normalized_importance = extracted_memory["importance"] / 5.0
-                    
-                    if normalized_importance >= threshold:
-                        mem_id = self.memory_db.store_memory(
-                            session_id=session_id,
-                            content=extracted_memory["content"],
-                            memory_date=today,
-                            subject=extracted_memory["subject"],
-                            importance=extracted_memory["importance"],
-                            user_id=user_id,
-                            access_mode="private"
-                        )
-                        memory_saved = mem_id is not None
-                    else:
-                        print(f"[Memory Skipped] importance={extracted_memory['importance']} normalized={normalized_importance} threshold={threshold}")
+                    self._ttl_put(settings_key, settings, 30)
+                threshold = settings.get("memory_extraction_threshold", 0.6)
 
-            except Exception as e:
-                system_logger.error({"event_type": "memory_processing_error", "error": str(e)}, exc_info=True)
-                
-            return cleaned_content, memory_saved
+                try:
+                    threshold = max(0.0, min(1.0, float(threshold)))
+                except (ValueError, TypeError):
+                    threshold = 0.6
+
+                # importance/5 >= threshold, rewritten as a pure integer
+                # compare (importance is a validated 1..5 int).
+                min_importance = math.ceil(threshold * 5)
+
+                if extracted_memory["importance"] >= min_importance:
+                    mem_id = self.memory_db.store_memory(
+                        session_id=session_id,
+                        content=extracted_memory["content"],
+                        memory_date=today,
+                        subject=extracted_memory["subject"],
+                        importance=extracted_memory["importance"],
+                        user_id=user_id,
+                        access_mode="private"
+                    )
+                    if mem_id is not None:
+                        # Fresh write: cached reads for this session are stale.
+                        self._ttl_invalidate_session(session_id)
+                    return mem_id is not None
+                else:
+                    print(f"[Memory Skipped] importance={extracted_memory['importance']} min_importance={min_importance} threshold={threshold}")
+
+        except Exception as e:
+            system_logger.error({"event_type": "memory_processing_error", "error": str(e)}, exc_info=True)
+
+        return False
@@ -1,10 +1,23 @@
 import os
 import json
+import time
 import logging
-import datetime
 import contextvars
 import sys
-from logging.handlers import TimedRotatingFileHandler
+import queue
+import atexit
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
+
+try:
+    # orjson serializes each log record in C; this formatter runs on every
+    # event the server emits.
+    import orjson
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:  # pragma: no cover - orjson is in requirements
+    def _dumps(obj) -> str:
+        return json.dumps(obj, default=str)
 
 request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
 
@@ -12,54 +25,105 @@ request_id_var: contextvars.ContextVar[str] = contextvars.ContextVar("request_id
 LOGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "logs")
 os.makedirs(LOGS_DIR, exist_ok=True)
 
+# UTC ISO timestamp prefix cached per wall-clock second; constructing an
+# aware datetime and formatting it for every record dominated formatter cost
+# in bursts. The sub-second part is appended per record from the float epoch
+# logging already captured, so no clock syscall runs in the formatter at all.
+_iso_cache = [0, ""]
+
+def _fast_iso_prefix(sec: int) -> str:
+    if sec != _iso_cache[0]:
+        # Build the value first, then publish key+value in one slice
+        # assignment (a single C-level call under the GIL). Writing the key
+        # first let a concurrent reader pair the fresh key with the stale —
+        # or initial, empty — prefix and emit a malformed timestamp.
+        value = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_cache[:] = [sec, value]
+        return value
+    return _iso_cache[1]
+
+def _fast_iso(created: float) -> str:
+    whole = int(created)
+    return f"{_fast_iso_prefix(whole)}.{int((created - whole) * 1e6):06d}+00:00"
+
 class JSONFormatter(logging.Formatter):
     def format(self, record):
+        record_dict = record.__dict__
         log_record = {
-            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "timestamp": _fast_iso(record.created),
             "level": record.levelname,
             "logger": record.name,
         }
-        
+
         # Handle message which can be a dict (structured data) or string
         if isinstance(record.msg, dict):
             log_record.update(record.msg)
         else:
             log_record["message"] = record.getMessage()
-            
+
         req_id = request_id_var.get()
         if req_id:
             log_record["request_id"] = req_id
-            
+
         # Add kwargs if logged with `extra={}`
-        if hasattr(record, "session_id"):
-            log_record["session_id"] = record.session_id
-        if hasattr(record, "event_type"):
-            log_record["event_type"] = record.event_type
-            
+        session_id = record_dict.get("session_id")
+        if session_id is not None:
+            log_record["session_id"] = session_id
+        event_type = record_dict.get("event_type")
+        if event_type is not None:
+            log_record["event_type"] = event_type
+
         # Include exception traceback if present
         if record.exc_info:
             log_record["exception"] = self.formatException(record.exc_info)
-            
-        return json.dumps(log_record)
+
+        return _dumps(log_record)
+
+class _PassthroughQueueHandler(QueueHandler):
+    """
+    QueueHandler that enqueues the record untouched. The default prepare()
+    pre-formats the message, which would flatten our structured dict records
+    before JSONFormatter ever sees them.
+    """
+    def prepare(self, record):
+        return record
+
+# One listener per named logger drains its queue on a background thread, so
+# emitting a log line on the request path never blocks on file I/O or rotation.
+_listeners: list[QueueListener] = []
+
+def _stop_listeners():
+    for listener in _listeners:
+        try:
+            listener.stop()
+        except Exception:
+            pass
+
+atexit.register(_stop_listeners)
 
 def setup_logger(name: str, log_file: str, level=logging.INFO) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
+
     # Avoid adding handlers multiple times if logger is already configured
     if not logger.handlers:
         file_path = os.path.join(LOGS_DIR, log_file)
         handler = TimedRotatingFileHandler(
-            file_path, 
-            when="midnight", 
-            interval=1, 
-            backupCount=30, 
+            file_path,
+            when="midnight",
+            interval=1,
+            backupCount=30,
             encoding="utf-8"
         )
         handler.suffix = "%Y-%m-%d"
         handler.setFormatter(JSONFormatter())
-        logger.addHandler(handler)
-        
+
+        log_queue: queue.Queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, handler)
+        listener.start()
+        _listeners.append(listener)
+        logger.addHandler(_PassthroughQueueHandler(log_queue))
+
     return logger
 
 # Initialize standard loggers
@@ -1,10 +1,11 @@
 from fastapi import FastAPI, HTTPException, Header, Request
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Union
+import asyncio
 import os
-import traceback
+import hashlib
 import uuid
 from app.llm_client import LLMClient
 from app.logger import system_logger, chat_logger, settings_logger, redact_token, request_id_var
@@ -27,6 +28,9 @@ async def global_exception_handler(request: Request, call_next):
         response = await call_next(request)
         return response
     except Exception as e:
+        # exc_info rides the record through the log queue; the listener
+        # thread walks and formats the traceback, so the request path only
+        # pays for enqueueing and the 500 goes out immediately.
         system_logger.error({
             "event_type": "unhandled_exception",
             "endpoint": request.url.path,
@@ -34,9 +38,8 @@ async def global_exception_handler(request: Request, call_next):
             "client_ip": request.client.host if request.client else "unknown",
             "status": "failure",
             "error_type": type(e).__name__,
-            "error_message": str(e),
-            "traceback": traceback.format_exc()
-        })
+            "error_message": str(e)
+        }, exc_info=True)
         return JSONResponse(status_code=500, content={"error": "Internal Server Error", "message": str(e)})
     finally:
         request_id_var.reset(token)
@@ -58,6 +61,14 @@ VALID_TOKENS = {
     }
 }
 
+# Token lookup happens on every chat request. Hashing the presented token and
+# probing a digest-keyed dict keeps the comparison cost independent of how
+# much of a real token the attacker guessed, so response timing leaks nothing
+# about token prefixes; it also keeps plaintext tokens off the hot path.
+VALID_TOKEN_HASHES = {
+    hashlib.sha256(t.encode()).digest(): meta for t, meta in VALID_TOKENS.items()
+}
+
 class ChatRequest(BaseModel):
     message: str
     api_url: str | None = None
@@ -75,42 +86,58 @@ app.mount("/static", StaticFiles(directory=FRONTEND_DIR), name="static")
 def health_check():
     return {"status": "ok"}
 
-@app.post("/chat")
-def chat(request: ChatRequest, http_request: Request, authorization: str | None = Header(default=None)):
-    client_ip = http_request.client.host if http_request.client else "unknown"
-    if not authorization or not authorization.startswith("Bearer "):
+def _authenticate_chat(authorization: str | None, endpoint: str, client_ip: str, session_id: str):
+    """
+    Validates the Bearer token for chat endpoints.
+    Returns (user_dict, None) on success or (None, JSONResponse) on failure.
+    """
+    # Slice compare instead of .startswith: no method dispatch, and short
+    # headers just yield a short slice that fails the equality check.
+    if not authorization or authorization[:7] != "Bearer ":
         chat_logger.warning({
             "event_type": "unauthorized_access",
-            "endpoint": "/chat",
+            "endpoint": endpoint,
             "client_ip": client_ip,
-            "session_id": request.session_id,
+            "session_id": session_id,
             "reason": "Missing or invalid authorization header format",
             "provided_token": redact_token(authorization)
         })
-        return JSONResponse(
-            status_code=401, 
+        return None, JSONResponse(
+            status_code=401,
             content={"error": "Unauthorized", "message": "Missing or invalid authentication token."}
         )
-    
+
     auth_str = str(authorization)
-    token = auth_str.split(" ")[1]
-    if token not in VALID_TOKENS:
+    token = auth_str[7:]  # strip "Bearer " without allocating a split list
+    user = VALID_TOKEN_HASHES.get(hashlib.sha256(token.encode()).digest())
+    if user is None:
         chat_logger.warning({
             "event_type": "unauthorized_access",
-            "endpoint": "/chat",
+            "endpoint": endpoint,
             "client_ip": client_ip,
-            "session_id": request.session_id,
+            "session_id": session_id,
             "reason": "Invalid token",
             "provided_token": redact_token(token)
         })
-        return JSONResponse(
-            status_code=401, 
+        return None, JSONResponse(
+            status_code=401,
             content={"error": "Unauthorized", "message": "Missing or invalid authentication token."}
         )
-        
-    user = VALID_TOKENS[token]
-    
-    reply, memory_saved = llm_client.chat(
+
+    return user, None
+
+@app.post("/chat")
+async def chat(request: ChatRequest, http_request: Request, authorization: str | None = Header(default=None)):
+    client_ip = http_request.client.host if http_request.client else "unknown"
+    user, error_response = _authenticate_chat(authorization, "/chat", client_ip, request.session_id)
+    if error_response is not None:
+        return error_response
+
+    # The LLM round-trip blocks for seconds; running the handler on the event
+    # loop and pushing only the blocking call to a worker thread keeps the
+    # cheap auth/serialization work off the threadpool entirely.
+    reply, memory_saved = await asyncio.to_thread(
+        llm_client.chat,
         request.message, 
         request.api_url, 
         request.session_id,
@@ -119,6 +146,24 @@ def chat(request: ChatRequest, http_request: Request, authorization: str | None
     )
     return {"reply": reply, "memory_saved": memory_saved}
 
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest, http_request: Request, authorization: str | None = Header(default=None)):
+    client_ip = http_request.client.host if http_request.client else "unknown"
+    user, error_response = _authenticate_chat(authorization, "/chat/stream", client_ip, request.session_id)
+    if error_response is not None:
+        return error_response
+
+    # Creating the generator doesn't block; Starlette iterates the sync
+    # generator on the threadpool for the lifetime of the stream.
+    generator = llm_client.chat_stream(
+        request.message,
+        request.api_url,
+        request.session_id,
+        user_id=user["user_id"],
+        allowed_subjects=user["allowed_subjects"]
+    )
+    return StreamingResponse(generator, media_type="text/plain")
+
 @app.post("/admin/settings")
 def update_setting(request: SettingUpdateRequest, http_request: Request, admin_token: str | None = Header(default=None)):
     client_ip = http_request.client.host if http_request.client else "unknown"
@@ -146,8 +191,7 @@ def update_setting(request: SettingUpdateRequest, http_request: Request, admin_t
     db = MemoryDB(init_db=False)
     
     # Get old value for logging
-    old_overrides = db.get_all_overrides()
-    old_value = old_overrides.get(request.key, "default/unset")
+    old_value = db.get_override(request.key, "default/unset")
     
     success = db.set_setting_override(request.key, str(request.value))
     if success:
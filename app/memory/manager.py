@@ -1,39 +1,111 @@
 import os
 import json
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from app.settings import MAX_CHAT_HISTORY
 
+try:
+    # History is (de)serialized one line per message on every turn; orjson
+    # does both in C and emits UTF-8 bytes directly, so the files are opened
+    # in binary mode and no per-line str encode/decode pass runs.
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+    _loads = json.loads
+
 # Point to Daftar/data/workspace
 MEMORY_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "data", "workspace")
 
+_SESSION_ID_RE = re.compile(r"[^A-Za-z0-9_-]")
+
+@lru_cache(maxsize=1024)
+def _session_file_path(session_id: str) -> str:
+    """
+    Maps a raw session id to its history file path. A session id recurs on
+    every turn of its conversation, so the sanitize-and-join result is cached;
+    the regex sub runs in C in the (rare) uncached case, replacing the
+    per-character isalnum() generator walk.
+    """
+    safe_id = _SESSION_ID_RE.sub("", session_id) or "default"
+    return os.path.join(MEMORY_DIR, f"history_{safe_id}.json")
+
 class MemoryManager:
+    # Per-session-file write locks, bounded the same way as LLMClient's
+    # session lock map. Sharding by file path means concurrent writes to
+    # different sessions never contend; only same-session writers queue.
+    # Module-wide (class-level) so multiple manager instances serialize
+    # against each other too.
+    _FILE_LOCKS: OrderedDict = OrderedDict()
+    _FILE_LOCKS_MAX = 512
+    _file_locks_guard = threading.Lock()
+
     def __init__(self):
         os.makedirs(MEMORY_DIR, exist_ok=True)
-        
+        # Tracks line counts per session file so append() knows when to
+        # compact without re-reading the file each turn.
+        self._line_counts = {}
+        self._line_counts_lock = threading.Lock()
+
+    def _lock_for(self, file_path: str) -> threading.Lock:
+        with MemoryManager._file_locks_guard:
+            lock = MemoryManager._FILE_LOCKS.get(file_path)
+            if lock is None:
+                lock = threading.Lock()
+                MemoryManager._FILE_LOCKS[file_path] = lock
+            MemoryManager._FILE_LOCKS.move_to_end(file_path)
+            while len(MemoryManager._FILE_LOCKS) > MemoryManager._FILE_LOCKS_MAX:
+                MemoryManager._FILE_LOCKS.popitem(last=False)
+            return lock
+
     def _sanitize_session_id(self, session_id: str) -> str:
-        safe_id = "".join(c for c in session_id if c.isalnum() or c in ("-", "_"))
+        safe_id = _SESSION_ID_RE.sub("", session_id)
         return safe_id if safe_id else "default"
 
     def _get_file_path(self, session_id: str) -> str:
-        safe_session_id = self._sanitize_session_id(session_id)
-        return os.path.join(MEMORY_DIR, f"history_{safe_session_id}.json")
-        
+        return _session_file_path(session_id)
+
+    def _parse_history(self, content: bytes) -> list:
+        """
+        Parses a history file. The current format is JSON Lines (one message
+        per line, O(1) appends); legacy files holding a single JSON array are
+        still understood.
+        """
+        content = content.strip()
+        if not content:
+            return []
+
+        if content.startswith(b"["):
+            # Legacy full-array format from before append-only persistence
+            messages = _loads(content)
+            return messages if isinstance(messages, list) else []
+
+        messages = []
+        for line in content.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            msg = _loads(line)
+            if isinstance(msg, dict):
+                messages.append(msg)
+        return messages
+
     def load(self, session_id: str) -> list:
         file_path = self._get_file_path(session_id)
-        
+
         if not os.path.exists(file_path):
             return []
-            
+
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read().strip()
-                if not content:
-                    return []
-                messages = json.loads(content)
-                if not isinstance(messages, list):
-                    return []
-                
-                # Filter out system messages just in case they slipped in
-                return [m for m in messages if m.get("role") in ("user", "assistant")]
+            with open(file_path, "rb") as f:
+                messages = self._parse_history(f.read())
+
+            # Filter out system messages just in case they slipped in
+            return [m for m in messages if m.get("role") in ("user", "assistant")]
         except json.JSONDecodeError:
             # Corrupt file, backup and start fresh
             safe_session_id = self._sanitize_session_id(session_id)
@@ -50,19 +122,83 @@ class MemoryManager:
         # We assume messages are already pruned and contain no system prompts
         # but let's be double safe
         safe_messages = [m for m in messages if m.get("role") in ("user", "assistant")]
-        
+
         file_path = self._get_file_path(session_id)
-        tmp_path = file_path + ".tmp"
-        
+
         try:
-            with open(tmp_path, "w", encoding="utf-8") as f:
-                json.dump(safe_messages, f, indent=2, ensure_ascii=False)
-                
-            os.replace(tmp_path, file_path)
+            with self._lock_for(file_path):
+                self._save_locked(session_id, safe_messages, file_path)
         except Exception as e:
             # Let it fail gracefully or log it in real scenario
             print(f"Error saving history for session {session_id}: {e}")
 
+    def _save_locked(self, session_id: str, safe_messages: list, file_path: str) -> None:
+        """Writes a snapshot; caller must hold the session's file lock."""
+        tmp_path = file_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            for msg in safe_messages:
+                f.write(_dumps(msg))
+                f.write(b"\n")
+
+        os.replace(tmp_path, file_path)
+        with self._line_counts_lock:
+            self._line_counts[file_path] = len(safe_messages)
+
+    @staticmethod
+    def _is_legacy_array_file(file_path: str) -> bool:
+        """True if the history file still holds the pre-JSONL `[...]` array."""
+        try:
+            with open(file_path, "rb") as f:
+                return f.read(64).lstrip().startswith(b"[")
+        except OSError:
+            return False
+
+    def append(self, session_id: str, message: dict) -> None:
+        """
+        Appends a single message to the session history in O(1) instead of
+        rewriting the whole file. Compacts back down to MAX_CHAT_HISTORY once
+        the file grows past twice the cap.
+        """
+        if message.get("role") not in ("user", "assistant"):
+            return
+
+        file_path = self._get_file_path(session_id)
+
+        try:
+            # Same-session appenders queue here; other sessions proceed on
+            # their own shard. The lock covers the count read-modify-write
+            # and the compaction decision, so two racing appenders can't
+            # both see a stale count or compact simultaneously.
+            with self._lock_for(file_path):
+                with self._line_counts_lock:
+                    count = self._line_counts.get(file_path)
+
+                if count is None:
+                    # First touch of this session in this process: establish
+                    # the real count. A legacy array-format file must be
+                    # rewritten as JSONL here and now — appending a line
+                    # after the `[...]` array would leave the file
+                    # unparseable, and the next load() would quarantine it
+                    # as corrupt and drop the whole history.
+                    history = self.load(session_id)
+                    count = len(history)
+                    if self._is_legacy_array_file(file_path):
+                        self._save_locked(session_id, history, file_path)
+
+                with open(file_path, "ab") as f:
+                    f.write(_dumps(message))
+                    f.write(b"\n")
+                count += 1
+
+                if count > 2 * MAX_CHAT_HISTORY:
+                    history = self.prune(self.load(session_id))
+                    self._save_locked(session_id, history, file_path)
+                else:
+                    with self._line_counts_lock:
+                        self._line_counts[file_path] = count
+        except Exception as e:
+            print(f"Error appending history for session {session_id}: {e}")
+
     def prune(self, messages: list, reserve: int = 0) -> list:
         """
         Prunes the history to MAX_CHAT_HISTORY - reserve.
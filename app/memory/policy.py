@@ -1,10 +1,87 @@
 from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+from types import MappingProxyType
 import hashlib
 import time
+import random
+import threading
 
 from app.memory.db import MemoryDB
 from app.logger import memory_logger
 
+# Token sets of stored memories, keyed by memory id. Memory content is
+# append-only (edits create new rows), so entries never go stale; the LRU
+# bound just stops the cache growing with the full history of a long-lived
+# process. Without this, _find_conflict re-lowercases and re-splits every
+# active memory's content on every single store call.
+_TOKEN_SETS: "OrderedDict[int, frozenset]" = OrderedDict()
+_TOKEN_SETS_MAX = 1024
+_token_sets_lock = threading.Lock()
+
+# Precedence mapping for deterministic resolution. Built once; the per-call
+# version allocated a fresh dict for every evaluation.
+_PRECEDENCE = {"manual": 3, "imported": 2, "inferred": 1}
+
+# Response skeletons for the success branches: the constant fields are
+# assembled once and each return merges in only the per-call values. Kept as
+# plain dicts because callers json.dumps these payloads.
+_RESP_SUPERSEDED = {
+    "status": "success",
+    "notification": "🧠 Memory updated",
+    "stored": True,
+    "summary": "Superseded existing fact",
+    "reason_code": "SUPERSEDE_REASON_CONTENT_OVERLAP",
+}
+
+_RESP_ACCEPTED = {
+    "status": "success",
+    "notification": "🧠 Saved to memory",
+    "stored": True,
+    "reason_code": "ACCEPT_REASON_NEW_FACT",
+}
+
+# Fully constant outcomes. Wrapped in MappingProxyType so nothing can
+# accidentally mutate the templates in place; the hot branches hand out
+# dict(...) copies because the tool layer json-serializes (and may
+# annotate) whatever the policy returns.
+_RESP_EXISTS_EXACT = MappingProxyType({
+    "status": "exists",
+    "notification": "✅ Memory already exists",
+    "stored": False,
+    "detail": "This exact memory was already active.",
+    "reason_code": "EXISTS_REASON_EXACT_MATCH",
+})
+
+_RESP_REJECT_PRECEDENCE = MappingProxyType({
+    "status": "rejected",
+    "notification": "⚠️ Memory not saved (lower precedence)",
+    "stored": False,
+    "detail": "A higher or equal priority memory already exists for this topic.",
+    "reason_code": "REJECT_REASON_PRECEDENCE_TOO_LOW",
+})
+
+_RESP_EXISTS_NATIVE = MappingProxyType({
+    "status": "exists",
+    "notification": "✅ Memory already exists",
+    "stored": False,
+    "detail": "Native DB constraint blocked identical active memory.",
+    "reason_code": "EXISTS_REASON_NATIVE_CONSTRAINT",
+})
+
+def _memory_token_set(memory_id: int, content: str) -> frozenset:
+    """Returns the (cached) lowercase token set for a stored memory."""
+    with _token_sets_lock:
+        tokens = _TOKEN_SETS.get(memory_id)
+        if tokens is not None:
+            _TOKEN_SETS.move_to_end(memory_id)
+            return tokens
+    tokens = frozenset(content.lower().split())
+    with _token_sets_lock:
+        _TOKEN_SETS[memory_id] = tokens
+        if len(_TOKEN_SETS) > _TOKEN_SETS_MAX:
+            _TOKEN_SETS.popitem(last=False)
+    return tokens
+
 class PolicyEngine:
     """
     The strict deterministic lifecycle policy engine governing all memory state transitions.
@@ -36,19 +113,23 @@ class PolicyEngine:
             "source": source
         })
 
-        import time
-        import random
-        
         max_retries = 5
-        base_delay = 0.1
+        # SlotBackoff: losers of an OCC race pick a random slot in a window
+        # that grows linearly with the attempt number, sized by how long one
+        # evaluation actually takes. Exponential backoff parks every
+        # contender for the same doubling window and they stampede together;
+        # random slots spread the retries out instead.
+        slot_unit = 0.0
 
         for attempt in range(max_retries):
+            if attempt:
+                time.sleep(random.uniform(0, attempt) * slot_unit)
+            attempt_start = time.perf_counter()
+
             # 1. Fetch active memories for this session/user/subject
             active_memories = self.db.get_active_memories_by_subject(session_id, user_id, subject)
 
-            # Precedence mapping for deterministic resolution
-            precedence = {"manual": 3, "imported": 2, "inferred": 1}
-            incoming_priority = precedence.get(source, 1)
+            incoming_priority = _PRECEDENCE.get(source, 1)
 
             # 2. Conflict / Supersede Logic
             conflict_mem = self._find_conflict(content, active_memories)
@@ -57,67 +138,59 @@ class PolicyEngine:
                 # Exact equality check handled heuristically here. DB Constraint is the hard barrier.
                 existing_content = conflict_mem['content']
                 if content.strip() == existing_content.strip():
-                    reason = "EXISTS_REASON_EXACT_MATCH"
+                    reason = _RESP_EXISTS_EXACT["reason_code"]
                     self._log_policy_decision("EXISTS", reason, correlation_id, session_id, user_id)
-                    return {
-                        "status": "exists",
-                        "notification": "✅ Memory already exists",
-                        "stored": False,
-                        "detail": "This exact memory was already active.",
-                        "reason_code": reason
-                    }
+                    return dict(_RESP_EXISTS_EXACT)
 
-                existing_priority = precedence.get(conflict_mem['source'], 1)
+                existing_priority = _PRECEDENCE.get(conflict_mem['source'], 1)
                 
                 # Strict Precedence Rule: Overrule LLM if existing fact is higher priority or same priority with STRICTLY HIGHER confidence
                 if incoming_priority < existing_priority or (incoming_priority == existing_priority and confidence_score < conflict_mem['confidence_score']):
-                    reason = "REJECT_REASON_PRECEDENCE_TOO_LOW"
+                    reason = _RESP_REJECT_PRECEDENCE["reason_code"]
                     self._log_policy_decision("REJECT", reason, correlation_id, session_id, user_id, conflicting_id=conflict_mem['id'])
-                    return {
-                        "status": "rejected",
-                        "notification": "⚠️ Memory not saved (lower precedence)",
-                        "stored": False,
-                        "detail": "A higher or equal priority memory already exists for this topic.",
-                        "reason_code": reason
-                    }
+                    return dict(_RESP_REJECT_PRECEDENCE)
                 else:
-                    # SUPERSEDE: Optimistic Concurrency Control (OCC)
-                    # We only update if the state is still 'active'.
-                    success = self.db.set_memory_state(conflict_mem['id'], "superseded")
-                    if not success:
-                        # RACE CONDITION TRIGGERED! Another thread mutated this memory before we could.
-                        # We must rollback our conceptual state and retry the evaluation from scratch.
+                    # SUPERSEDE: single atomic compare-and-swap in the DB.
+                    # The UPDATE only lands while the conflicting row is
+                    # still 'active'; the replacement insert commits in the
+                    # same transaction, so there is no conceptual state to
+                    # roll back by hand on any failure path.
+                    new_id, raced = self.db.supersede_and_insert(
+                        conflict_mem['id'],
+                        session_id=session_id, content=content, memory_date=memory_date,
+                        subject=subject, importance=importance, user_id=user_id, access_mode=access_mode,
+                        confidence_score=confidence_score, source=source, correlation_id=correlation_id
+                    )
+
+                    if raced:
+                        # Another thread mutated this memory before we could;
+                        # retry the evaluation from scratch.
+                        if not slot_unit:
+                            slot_unit = max(time.perf_counter() - attempt_start, 0.005)
                         memory_logger.warning({
                             "event_type": "occ_race_condition",
                             "correlation_id": correlation_id,
                             "attempt": attempt,
                             "memory_id": conflict_mem['id']
                         })
-                        time.sleep(base_delay * (2 ** attempt) + random.uniform(0, 0.05))
                         continue # Retry the loop
 
-                    new_id = self.db.insert_memory(
-                        session_id=session_id, content=content, memory_date=memory_date,
-                        subject=subject, importance=importance, user_id=user_id, access_mode=access_mode,
-                        state="active", supersedes_memory_id=conflict_mem['id'], 
-                        confidence_score=confidence_score, source=source, correlation_id=correlation_id
-                    )
-                    
                     if new_id == -1:
-                        # Should be very rare during a supersede, but handled for parity
-                        self.db.set_memory_state(conflict_mem['id'], "active") # Rollback conceptual supersede
+                        # Duplicate active content surfaced mid-supersede; the
+                        # transaction rolled back, so the conflicting row is
+                        # still active and the retry re-evaluates cleanly.
+                        # Seed the backoff like the raced path, or every
+                        # remaining attempt sleeps 0 and re-runs immediately.
+                        if not slot_unit:
+                            slot_unit = max(time.perf_counter() - attempt_start, 0.005)
                         continue
 
-                    reason = "SUPERSEDE_REASON_CONTENT_OVERLAP"
+                    reason = _RESP_SUPERSEDED["reason_code"]
                     self._log_policy_decision("SUPERSEDE", reason, correlation_id, session_id, user_id, supersedes_id=conflict_mem['id'], new_id=new_id)
                     return {
-                        "status": "success",
-                        "notification": "🧠 Memory updated",
-                        "stored": True,
+                        **_RESP_SUPERSEDED,
                         "memory_id": new_id,
                         "memory_type": subject.lower(),
-                        "summary": "Superseded existing fact",
-                        "reason_code": reason
                     }
 
             # ACCEPT -> No conflicts and passes logical constraints
@@ -130,30 +203,21 @@ class PolicyEngine:
             
             if new_id == -1:
                 # IDENTICAL INSERT FLOOD DETECTED NATIVELY BY DB CONSTRAINT
-                reason = "EXISTS_REASON_NATIVE_CONSTRAINT"
+                reason = _RESP_EXISTS_NATIVE["reason_code"]
                 self._log_policy_decision("EXISTS", reason, correlation_id, session_id, user_id)
-                return {
-                    "status": "exists",
-                    "notification": "✅ Memory already exists",
-                    "stored": False,
-                    "detail": "Native DB constraint blocked identical active memory.",
-                    "reason_code": reason
-                }
+                return dict(_RESP_EXISTS_NATIVE)
 
             if not new_id:
                 return {"status": "error", "reason": "Failed to store memory"}
 
-            reason = "ACCEPT_REASON_NEW_FACT"
+            reason = _RESP_ACCEPTED["reason_code"]
             self._log_policy_decision("ACCEPT", reason, correlation_id, session_id, user_id, new_id=new_id)
-            
+
             return {
-                "status": "success",
-                "notification": "🧠 Saved to memory",
-                "stored": True,
+                **_RESP_ACCEPTED,
                 "memory_id": new_id,
                 "memory_type": subject.lower(),
                 "summary": content[:50] + "..." if len(content) > 50 else content,
-                "reason_code": reason
             }
             
         return {"status": "error", "reason": f"Max OCC retries ({max_retries}) exceeded due to high contention."}
@@ -164,11 +228,24 @@ class PolicyEngine:
         Future optimization: Semantic embeddings.
         """
         words = set(new_content.lower().split())
+        if not words:
+            return None
+        q_len = len(words)
+        # Bound once outside the loop: skips the per-candidate attribute
+        # lookups on the query set. Note there is no valid length-ratio
+        # skip here — the metric is the overlap coefficient (denominator is
+        # the SMALLER set), so a short memory fully contained in a long one
+        # still scores 1.0 regardless of the size disparity.
+        isdisjoint = words.isdisjoint
+        intersection = words.intersection
         for mem in active_memories:
-            existing_words = set(mem['content'].lower().split())
-            if not words or not existing_words:
+            existing_words = _memory_token_set(mem['id'], mem['content'])
+            # Cheap candidate filter: a ≥60% overlap needs at least one shared
+            # token, and isdisjoint short-circuits in C without building the
+            # intersection. Most non-matching candidates exit here.
+            if not existing_words or isdisjoint(existing_words):
                 continue
-            overlap = len(words.intersection(existing_words)) / min(len(words), len(existing_words))
+            overlap = len(intersection(existing_words)) / min(q_len, len(existing_words))
             # If 60% overlap or more, treat it as a conflict
             if overlap >= 0.6:
                 return mem
@@ -194,9 +271,8 @@ class PolicyEngine:
         The strictly governed Retrieval Contract.
         No retrieval bypasses the PolicyEngine.
         """
-        import time
         start_time = time.time()
-        
+
         # 1. Input Validation
         if not user_id:
             return {"status": "error", "detail": "user_id is strictly required for retrieval."}
@@ -1,40 +1,101 @@
 import json
 import os
+import threading
+import time
 from app.logger import system_logger
 
+try:
+    # defaults.json is read as raw bytes; orjson parses them in C without a
+    # text-decode pass.
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements
+    _loads = json.loads
+
 _default_config = os.path.join(os.path.dirname(__file__), "config", "defaults.json")
 CONFIG_PATH = os.environ.get("DAFTAR_CONFIG_PATH", _default_config)
 # Static setting, not dynamically configurable via DB yet
 MAX_CHAT_HISTORY = 20
 
+# load_settings runs on every store/retrieve tool call; the cache turns the
+# defaults-file read plus overrides query into a dict copy unless either
+# defaults.json's mtime or the process-wide overrides version has moved.
+# The overrides version only counts this process's writes, so the TTL —
+# same 5s promise as the DB layer's own overrides cache — bounds staleness
+# against writers in other processes sharing the DB.
+_CACHE_TTL = 5.0
+_cache_lock = threading.Lock()
+_cache_sig = None
+_cache_val = None
+_cache_expires = 0.0
+
+def invalidate():
+    """Drops the cached settings (for tests and out-of-band config edits)."""
+    global _cache_sig, _cache_val, _cache_expires
+    with _cache_lock:
+        _cache_sig = None
+        _cache_val = None
+        _cache_expires = 0.0
+
 def coerce_value(key, value):
     if key == "memory_extraction_threshold":
         return float(value)
     return value
 
 def load_settings(db=None):
-    settings = {}
-    if os.path.exists(CONFIG_PATH):
-        try:
-            with open(CONFIG_PATH, "r") as f:
-                loaded = json.load(f)
-                if isinstance(loaded, dict):
-                    settings = loaded
-        except Exception as e:
-            system_logger.error({"event_type": "load_defaults_failed", "error": str(e)}, exc_info=True)
-            
+    global _cache_sig, _cache_val, _cache_expires
+
+    try:
+        config_mtime = os.stat(CONFIG_PATH).st_mtime_ns
+    except OSError:
+        config_mtime = None
+
+    overrides_version = None
     try:
         if db is None:
             from memory.db import MemoryDB
             db = MemoryDB(init_db=False)
-        overrides = db.get_all_overrides()
-        for k, v in overrides.items():
-            try:
-                settings[k] = coerce_value(k, v)
-            except Exception as e:
-                system_logger.error({"event_type": "coerce_override_failed", "key": k, "value": v, "error": str(e)}, exc_info=True)
+        overrides_version = db.get_overrides_version()
     except Exception as e:
         system_logger.error({"event_type": "load_overrides_failed", "error": str(e)}, exc_info=True)
-        
-    return settings
+        db = None
 
+    # Only trust the cache when the overrides version is known; a failed DB
+    # lookup falls through to a plain defaults-only load, uncached.
+    sig = (config_mtime, overrides_version)
+    if overrides_version is not None:
+        with _cache_lock:
+            if sig == _cache_sig and time.time() < _cache_expires:
+                return dict(_cache_val)
+
+    settings = {}
+    try:
+        # EAFP: one open() instead of an exists() stat plus an open(), which
+        # also closes the TOCTOU window between the two.
+        with open(CONFIG_PATH, "rb") as f:
+            loaded = _loads(f.read())
+        if isinstance(loaded, dict):
+            settings = loaded
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        system_logger.error({"event_type": "load_defaults_failed", "error": str(e)}, exc_info=True)
+
+    if db is not None:
+        try:
+            overrides = db.get_all_overrides()
+            for k, v in overrides.items():
+                try:
+                    settings[k] = coerce_value(k, v)
+                except Exception as e:
+                    system_logger.error({"event_type": "coerce_override_failed", "key": k, "value": v, "error": str(e)}, exc_info=True)
+        except Exception as e:
+            system_logger.error({"event_type": "load_overrides_failed", "error": str(e)}, exc_info=True)
+
+    if overrides_version is not None:
+        with _cache_lock:
+            _cache_sig = sig
+            _cache_val = dict(settings)
+            _cache_expires = time.time() + _CACHE_TTL
+
+    return settings
@@ -1,4 +1,5 @@
 import os
+import mmap
 from pathlib import Path
 from app.logger import tool_logger
 
@@ -33,7 +34,9 @@ class FilesTool:
                 
             file_path = (self.base_dir / path_obj).resolve()
 
-            if not str(file_path).startswith(str(self.base_dir)):
+            # commonpath compares whole components, so a sibling like
+            # /workspace-evil can't slip past a raw string-prefix check.
+            if os.path.commonpath([str(file_path), str(self.base_dir)]) != str(self.base_dir):
                 tool_logger.warning({
                     "event_type": "tool_call_blocked",
                     "tool_name": "read_file",
@@ -61,7 +64,8 @@ class FilesTool:
                 })
                 raise ValueError(f"Path is not a regular file: {path}")
 
-            if file_path.stat().st_size > 1_000_000:
+            size = file_path.stat().st_size
+            if size > 1_000_000:
                 tool_logger.warning({
                     "event_type": "tool_call_failed",
                     "tool_name": "read_file",
@@ -70,8 +74,17 @@ class FilesTool:
                 })
                 raise ValueError(f"File too large: {path}")
 
+            # Map the file once and decode from the same buffer, so the
+            # utf-16 fallback re-decodes in memory instead of re-reading the
+            # whole file from disk like read_text() did.
+            if size == 0:
+                data = b""
+            else:
+                with open(file_path, "rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        data = mm[:]
             try:
-                content = file_path.read_text(encoding="utf-8")
+                content = data.decode("utf-8")
             except UnicodeDecodeError:
                 tool_logger.info({
                     "event_type": "tool_call_retry_encoding",
@@ -79,7 +92,7 @@ class FilesTool:
                     "path": path,
                     "encoding_tried": "utf-16"
                 })
-                content = file_path.read_text(encoding="utf-16")
+                content = data.decode("utf-16")
                 
             tool_logger.info({
                 "event_type": "tool_call_success",
@@ -1,8 +1,89 @@
 import datetime
+import json
+import sys
+import uuid
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 from app.logger import tool_logger
 from app.settings import load_settings
 
+_GENERAL = sys.intern("General")
+
+@lru_cache(maxsize=2048)
+def _normalize_subject(subject: str) -> str:
+    """
+    Strip whitespace and Title Case the subject for consistency. Subjects
+    recur constantly ("Work", "Preferences", ...), so the result is cached
+    and interned: repeat calls are a dict hit, and downstream set/dict
+    membership checks compare by pointer before falling back to chars.
+    """
+    if not subject:
+        return _GENERAL
+    return sys.intern(subject.strip().title())
+
+def _validate_date(date_text: str) -> bool:
+    try:
+        datetime.datetime.strptime(date_text, "%Y-%m-%d")
+        return True
+    except ValueError:
+        return False
+
+def _v_date(ctx):
+    if _validate_date(ctx["memory_date"]):
+        return None
+    reason = f"Invalid date format: {ctx['memory_date']}. Expected YYYY-MM-DD."
+    return ("warning", "tool_call_rejected",
+            {"status": "error", "reason": reason, "notification": "⚠️ Memory not saved (invalid date)", "stored": False})
+
+def _v_importance_type(ctx):
+    if isinstance(ctx["importance"], int):
+        return None
+    reason = f"Importance must be an integer, got {type(ctx['importance'])}."
+    return ("warning", "tool_call_rejected",
+            {"status": "error", "reason": reason, "notification": "⚠️ Memory not saved (invalid importance)", "stored": False})
+
+def _v_threshold(ctx):
+    if ctx["importance"] >= ctx["threshold"]:
+        return None
+    return ("info", "memory_store_rejected",
+            {"status": "rejected", "reason": "importance_below_threshold",
+             "detail": f"Importance {ctx['importance']} is below threshold {ctx['threshold']}",
+             "notification": "⚠️ Memory not saved (below threshold)", "stored": False})
+
+def _v_subject(ctx):
+    if ctx["allow_all"] or ctx["norm_subject"] in ctx["allowed_subjects"]:
+        return None
+    return ("info", "memory_store_rejected",
+            {"status": "rejected", "reason": "subject_not_allowed",
+             "detail": f"Subject '{ctx['norm_subject']}' is not in allowed subjects.",
+             "notification": "⚠️ Memory not saved (subject not allowed)", "stored": False})
+
+# Declarative store_memory validation: each check inspects the prepared
+# context and returns (log_level, event_type, error_response) on failure, or
+# None to pass. One dispatch loop replaces the chain of log-and-return
+# branches and emits a single log record carrying the full context.
+_STORE_VALIDATORS = (_v_date, _v_importance_type, _v_threshold, _v_subject)
+
+@lru_cache(maxsize=64)
+def _compile_allowed_subjects(raw):
+    """
+    Compiles an allowed_subjects value (a tuple of subjects, or the raw JSON
+    string form stored in overrides) into (allow_all, normalized frozenset).
+    Returns None for malformed values so callers can fall back to allow-all.
+    Cached so the JSON parse and per-element normalization run once per
+    distinct settings value instead of on every tool call.
+    """
+    if isinstance(raw, str):
+        try:
+            parsed = json.loads(raw)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(parsed, list):
+            return None
+        raw = parsed
+    subjects = frozenset(_normalize_subject(s) for s in raw)
+    return "*" in subjects, subjects
+
 class MemoryTool:
     def __init__(self, db_instance=None):
         self.db = db_instance
@@ -16,16 +97,10 @@ class MemoryTool:
 
     def _normalize_subject(self, subject: str) -> str:
         """Strip whitespace and Title Case the subject for consistency."""
-        if not subject:
-            return "General"
-        return subject.strip().title()
+        return _normalize_subject(subject)
 
     def _validate_date(self, date_text: str) -> bool:
-        try:
-            datetime.datetime.strptime(date_text, "%Y-%m-%d")
-            return True
-        except ValueError:
-            return False
+        return _validate_date(date_text)
 
     def store_memory(self, content: str, memory_date: str, subject: str, importance: int, session_id: str = "default", user_id: str = "default_user", access_mode: str = "private") -> Dict[str, Any]:
         """
@@ -40,16 +115,6 @@ class MemoryTool:
             "importance": importance
         })
 
-        if not self._validate_date(memory_date):
-            reason = f"Invalid date format: {memory_date}. Expected YYYY-MM-DD."
-            tool_logger.warning({"event_type": "tool_call_rejected", "tool_name": "store_memory", "reason": reason})
-            return {"status": "error", "reason": reason, "notification": "⚠️ Memory not saved (invalid date)", "stored": False}
-
-        if not isinstance(importance, int):
-            reason = f"Importance must be an integer, got {type(importance)}."
-            tool_logger.warning({"event_type": "tool_call_rejected", "tool_name": "store_memory", "reason": reason})
-            return {"status": "error", "reason": reason, "notification": "⚠️ Memory not saved (invalid importance)", "stored": False}
-
         # Defensive settings loading
         try:
             settings = load_settings(self.db)
@@ -66,19 +131,18 @@ class MemoryTool:
             tool_logger.warning({"event_type": "malformed_setting", "setting": "memory_extraction_threshold", "value": settings.get("memory_extraction_threshold")})
             threshold = 3.0
 
-        raw_allowed_subjects = settings.get("allowed_subjects", ["*"]) # Default allow all if missing
-        if isinstance(raw_allowed_subjects, str):
-            import json
-            try:
-                raw_allowed_subjects = json.loads(raw_allowed_subjects)
-            except json.JSONDecodeError:
-                pass
-
-        if not isinstance(raw_allowed_subjects, list):
+        raw_allowed_subjects = settings.get("allowed_subjects", ("*",)) # Default allow all if missing
+        if isinstance(raw_allowed_subjects, list):
+            raw_allowed_subjects = tuple(raw_allowed_subjects)
+        try:
+            compiled = _compile_allowed_subjects(raw_allowed_subjects) if isinstance(raw_allowed_subjects, (str, tuple)) else None
+        except TypeError:
+            compiled = None
+        if compiled is None:
             tool_logger.warning({"event_type": "malformed_setting", "setting": "allowed_subjects", "value": raw_allowed_subjects})
-            allowed_subjects = ["*"]
+            allow_all, allowed_subjects = True, frozenset(("*",))
         else:
-            allowed_subjects = [self._normalize_subject(s) for s in raw_allowed_subjects]
+            allow_all, allowed_subjects = compiled
 
         norm_subject = self._normalize_subject(subject)
 
@@ -87,32 +151,34 @@ class MemoryTool:
             "normalized_subject": norm_subject,
             "importance": importance,
             "threshold": threshold,
-            "allowed_subjects": allowed_subjects
+            "allowed_subjects": sorted(allowed_subjects)
         }
 
-        # Enforce threshold
-        if importance < threshold:
-            reason = "importance_below_threshold"
-            tool_logger.info({
-                "event_type": "memory_store_rejected",
-                "reason": reason,
-                **log_context
-            })
-            return {"status": "rejected", "reason": reason, "detail": f"Importance {importance} is below threshold {threshold}", "notification": "⚠️ Memory not saved (below threshold)", "stored": False}
-
-        # Enforce subject filtering
-        if "*" not in allowed_subjects and norm_subject not in allowed_subjects:
-            reason = "subject_not_allowed"
-            tool_logger.info({
-                "event_type": "memory_store_rejected",
-                "reason": reason,
+        # Single dispatch over the declarative validators; the first failure
+        # logs one record with the full context and returns its response.
+        ctx = {
+            "memory_date": memory_date,
+            "importance": importance,
+            "threshold": threshold,
+            "allow_all": allow_all,
+            "allowed_subjects": allowed_subjects,
+            "norm_subject": norm_subject,
+        }
+        for check in _STORE_VALIDATORS:
+            failure = check(ctx)
+            if failure is None:
+                continue
+            level, event_type, response = failure
+            getattr(tool_logger, level)({
+                "event_type": event_type,
+                "tool_name": "store_memory",
+                "reason": response["reason"],
                 **log_context
             })
-            return {"status": "rejected", "reason": reason, "detail": f"Subject '{norm_subject}' is not in allowed subjects.", "notification": "⚠️ Memory not saved (subject not allowed)", "stored": False}
+            return response
 
         # Store Memory via Policy Engine
         try:
-            import uuid
             correlation_id = str(uuid.uuid4())
             result = self.policy.evaluate_and_store(
                 session_id=session_id,
@@ -138,14 +204,68 @@ class MemoryTool:
 
 
 
+    def get_daily_summary(self, memory_date: str, session_id: str = "default", user_id: str = "default_user") -> Dict[str, Any]:
+        """
+        Returns the day's memories grouped by subject, honouring the
+        allowed_subjects setting at read time: a later restriction hides
+        already-stored subjects without deleting them.
+        """
+        tool_logger.info({
+            "event_type": "tool_call_start",
+            "tool_name": "get_daily_summary",
+            "session_id": session_id,
+            "memory_date": memory_date
+        })
+
+        if not self._validate_date(memory_date):
+            reason = f"Invalid date format: {memory_date}. Expected YYYY-MM-DD."
+            tool_logger.warning({
+                "event_type": "tool_call_rejected",
+                "tool_name": "get_daily_summary",
+                "reason": reason
+            })
+            return {"status": "error", "reason": reason}
+
+        # Same defensive settings handling as store_memory: malformed
+        # allowed_subjects values fall back to allow-all.
+        try:
+            settings = load_settings(self.db)
+            raw_allowed_subjects = settings.get("allowed_subjects", ("*",))
+        except Exception as e:
+            tool_logger.error({"event_type": "settings_load_error", "error": str(e)})
+            raw_allowed_subjects = ("*",)
+        if isinstance(raw_allowed_subjects, list):
+            raw_allowed_subjects = tuple(raw_allowed_subjects)
+        try:
+            compiled = _compile_allowed_subjects(raw_allowed_subjects) if isinstance(raw_allowed_subjects, (str, tuple)) else None
+        except TypeError:
+            compiled = None
+        if compiled is None:
+            allow_all, allowed_subjects = True, frozenset(("*",))
+        else:
+            allow_all, allowed_subjects = compiled
+
+        scope = ["*"] if allow_all else sorted(allowed_subjects)
+        try:
+            summary = self.db.get_daily_aggregation(
+                session_id, memory_date, user_id=user_id, allowed_subjects=scope
+            )
+            return {"status": "success", "summary": summary}
+        except Exception as e:
+            tool_logger.error({
+                "event_type": "daily_summary_crashed",
+                "reason": str(e),
+                "session_id": session_id
+            })
+            return {"status": "error", "reason": f"Unexpected summary error: {e}"}
+
     def retrieve_memory(self, query: str = "", scope: Optional[List[str]] = None, state_filter: str = "active", limit: int = 5, user_id: str = "default_user") -> Dict[str, Any]:
         """
         Retrieves memories using the strictly governed Retrieval Contract.
         Enforces scope validation and relays to PolicyEngine.
         """
-        import uuid
         correlation_id = str(uuid.uuid4())
-        
+
         tool_logger.info({
             "event_type": "tool_call_start",
             "tool_name": "retrieve_memory",
@@ -160,28 +280,27 @@ class MemoryTool:
         # Defensive settings loading to validate scope whitelist
         try:
             settings = load_settings(self.db)
-            raw_allowed_subjects = settings.get("allowed_subjects", ["*"])
+            raw_allowed_subjects = settings.get("allowed_subjects", ("*",))
         except Exception as e:
             tool_logger.error({"event_type": "settings_load_error", "error": str(e)})
-            raw_allowed_subjects = ["*"]
-
-        if isinstance(raw_allowed_subjects, str):
-            import json
-            try:
-                raw_allowed_subjects = json.loads(raw_allowed_subjects)
-            except json.JSONDecodeError:
-                pass
+            raw_allowed_subjects = ("*",)
 
-        if not isinstance(raw_allowed_subjects, list):
-            allowed_subjects = ["*"]
+        if isinstance(raw_allowed_subjects, list):
+            raw_allowed_subjects = tuple(raw_allowed_subjects)
+        try:
+            compiled = _compile_allowed_subjects(raw_allowed_subjects) if isinstance(raw_allowed_subjects, (str, tuple)) else None
+        except TypeError:
+            compiled = None
+        if compiled is None:
+            allow_all, allowed_subjects = True, frozenset(("*",))
         else:
-            allowed_subjects = [self._normalize_subject(s) for s in raw_allowed_subjects]
+            allow_all, allowed_subjects = compiled
 
         # Scope validation
         if scope:
             for s in scope:
                 norm_s = self._normalize_subject(s)
-                if "*" not in allowed_subjects and norm_s not in allowed_subjects:
+                if not allow_all and norm_s not in allowed_subjects:
                     reason = f"Scope '{norm_s}' is not allowed by current policy settings."
                     tool_logger.warning({
                         "event_type": "tool_call_rejected",
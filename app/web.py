@@ -1,33 +1,24 @@
 import os
 import sys
+import asyncio
+import threading
 
 # Add the project root to sys.path so 'app.memory.db' resolves even if run from 'app/' dir
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from flask import Flask, request, jsonify
+from fastapi import FastAPI
+from fastapi.responses import HTMLResponse
+from jinja2 import Environment, BaseLoader
 from app.memory.db import MemoryDB
 
-app = Flask(__name__)
+app = FastAPI(title="Daftar Memory Engine")
 db = MemoryDB()
 
-@app.route("/", methods=["GET"])
-def index():
-    return jsonify({
-        "status": "online",
-        "message": "Welcome to the Daftar Memory Engine. Please navigate to /memories?user_id=default_user to view your active memories."
-    })
-
-@app.route("/memories", methods=["GET"])
-def get_memories():
-    user_id = request.args.get("user_id", "default_user")
-
-    memories = db.retrieve_memories(
-        user_id=user_id,
-        state_filter="active",
-        limit=20
-    )
-
-    html = '''
+# Compiled once at import: rendering reuses the compiled template code
+# instead of re-assembling the page with per-request string surgery.
+# autoescape also HTML-escapes memory content, which the old string
+# substitution never did.
+_MEMORIES_TEMPLATE = Environment(loader=BaseLoader(), autoescape=True).from_string('''
     <!DOCTYPE html>
     <html>
     <head>
@@ -49,32 +40,85 @@ def get_memories():
     <body>
         <div class="container">
             <h1>🧠 Active Memories</h1>
-            <div class="user-info">Viewing memory span for: <strong>{user_id}</strong></div>
-            
-            {cards}
-        </div>
-    </body>
-    </html>
-    '''
-    
-    if not memories:
-        cards = '<div class="empty">No active memories found for this user.</div>'
-    else:
-        cards = ""
-        for m in memories:
-            cards += f'''
+            <div class="user-info">Viewing memory span for: <strong>{{ user_id }}</strong></div>
+
+            {% for m in memories %}
             <div class="memory-card">
-                <div class="memory-content">{m['content']}</div>
+                <div class="memory-content">{{ m['content'] }}</div>
                 <div class="meta-tags">
-                    <span class="tag subject">🏷️ {m['subject']}</span>
-                    <span class="tag">Confidence: {m['confidence_score']}</span>
-                    <span class="tag source">Source: {m['source']}</span>
-                    <span class="tag">📅 {m['created_at']}</span>
+                    <span class="tag subject">🏷️ {{ m['subject'] }}</span>
+                    <span class="tag">Confidence: {{ m['confidence_score'] }}</span>
+                    <span class="tag source">Source: {{ m['source'] }}</span>
+                    <span class="tag">📅 {{ m['created_at'] }}</span>
                 </div>
             </div>
-            '''
-            
-    return html.replace('{user_id}', user_id).replace('{cards}', cards)
+            {% else %}
+            <div class="empty">No active memories found for this user.</div>
+            {% endfor %}
+        </div>
+    </body>
+    </html>
+''')
+
+class _RequestCoalescer:
+    """
+    Collapses concurrent identical requests into one DB call. The first
+    thread to arrive for a key becomes the leader and runs the fetch; any
+    thread arriving while that fetch is in flight waits on the leader's
+    event and shares its result instead of issuing a duplicate query.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def get(self, key, fetch):
+        with self._lock:
+            entry = self._inflight.get(key)
+            if entry is not None:
+                event, box = entry
+            else:
+                event, box = threading.Event(), {}
+                self._inflight[key] = (event, box)
+
+        if entry is not None:
+            event.wait()
+            if "error" in box:
+                raise box["error"]
+            return box["result"]
+
+        try:
+            box["result"] = fetch()
+            return box["result"]
+        except Exception as e:
+            box["error"] = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            event.set()
+
+_coalescer = _RequestCoalescer()
+
+@app.get("/")
+def index():
+    return {
+        "status": "online",
+        "message": "Welcome to the Daftar Memory Engine. Please navigate to /memories?user_id=default_user to view your active memories."
+    }
+
+@app.get("/memories", response_class=HTMLResponse)
+async def get_memories(user_id: str = "default_user"):
+    # The blocking SQLite read runs on the threadpool so the event loop keeps
+    # accepting connections; identical requests that overlap in time still
+    # share one query result through the coalescer.
+    memories = await asyncio.to_thread(
+        _coalescer.get,
+        (user_id, "active", 20),
+        lambda: db.retrieve_memories(user_id=user_id, state_filter="active", limit=20)
+    )
+
+    return _MEMORIES_TEMPLATE.render(user_id=user_id, memories=memories)
 
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
+    import uvicorn
+    uvicorn.run(app, host="0.0.0.0", port=5000)
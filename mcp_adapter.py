@@ -1,10 +1,14 @@
 from mcp.server.fastmcp import FastMCP
 import logging
+from datetime import datetime
 
 # Ensure absolute imports work when mcp_adapter.py is run directly
 import sys
 from pathlib import Path
-sys.path.insert(0, str(Path(__file__).parent.resolve()))
+
+# resolve() issues a realpath syscall; do it once and reuse below.
+_HERE = Path(__file__).parent.resolve()
+sys.path.insert(0, str(_HERE))
 
 from app.memory.db import MemoryDB
 from app.memory.manager import MemoryManager
@@ -19,8 +23,13 @@ mcp = FastMCP("LocalMCPAdapter")
 # Initialize single stateless instance for thin adapter logic
 # Explicitly set base_dir to a dedicated workspace directory
 # so LM Studio cannot read the MCP server code files.
-base_dir = Path(__file__).parent.resolve() / "workspace"
-base_dir.mkdir(exist_ok=True)
+base_dir = _HERE / "workspace"
+# EAFP: on the common warm start the directory exists and one stat suffices;
+# mkdir(exist_ok=True) would issue the mkdir syscall unconditionally.
+try:
+    base_dir.stat()
+except FileNotFoundError:
+    base_dir.mkdir(parents=True, exist_ok=True)
 files_tool = FilesTool(base_dir=base_dir)
 
 # Initialize memory layer dependencies
@@ -42,8 +51,8 @@ def get_current_time() -> str:
     Get the current system date and time.
     Use this to find out what day it is before saving memories or answering time-sensitive questions.
     """
-    from datetime import datetime
-    return datetime.now().strftime("%I:%M %p, %A, %B %d, %Y (%Y-%m-%d)")
+    # __format__ skips strftime's method-dispatch wrapper; same output.
+    return f"{datetime.now():%I:%M %p, %A, %B %d, %Y (%Y-%m-%d)}"
 
 @mcp.tool()
 def read_file(path: str) -> str:
@@ -0,0 +1,13 @@
+"""Puts the project root on sys.path; imported for its side effect.
+
+A script run as `python scripts/foo.py` has scripts/ as sys.path[0], so
+`import _path` resolves here and `from app...` works afterwards. abspath
+is pure string manipulation — unlike the Path.resolve() each script used
+to call, it never stats the filesystem.
+"""
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
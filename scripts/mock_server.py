@@ -1,66 +1,73 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Response
 import uvicorn
-from pydantic import BaseModel
-import re
+import json
+
+try:
+    # The stress harness hammers this endpoint; orjson handles both
+    # directions in C.
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is in requirements
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+    _loads = json.loads
 
 app = FastAPI()
 
-class ChatRequest(BaseModel):
-    model: str
-    messages: list
-    temperature: float = 0.7
+def _completion_bytes(content: str) -> bytes:
+    return _dumps({"choices": [{"message": {"content": content}}]})
+
+# Extraction dispatch table, scanned in order over one lowercased copy of the
+# user message. The if/elif chain re-lowercased the message for every branch,
+# so a miss walked the string up to 8 times; "sad" stays first to preserve
+# its precedence over the other needles.
+_MEM_TABLE = (
+    ("sad", "NONE"),
+    ("allergic", '{"content": "User is allergic to peanuts.", "subject": "Health", "importance": 5}'),
+    ("buy a house", '{"content": "User wants to buy a new house.", "subject": "Finance", "importance": 4}'),
+    ("learn piano", '{"content": "User is learning piano.", "subject": "Hobbies", "importance": 2}'),
+    ("went to the gym", '{"content": "User went to the gym.", "subject": "Health", "importance": 3}'),
+    ("had a team meeting", '{"content": "User had a team meeting.", "subject": "Work", "importance": 4}'),
+    ("deployed to production", '{"content": "User deployed system to production.", "subject": "Work", "importance": 5}'),
+    ("played tennis", '{"content": "User played tennis.", "subject": "Health", "importance": 2}'),
+)
+
+# Every extraction response is static, so the full completion envelope is
+# serialized once at import; a request resolves to ready-made bytes instead
+# of a dict that FastAPI would validate and re-serialize per call.
+_MEM_RESPONSES = tuple((k, _completion_bytes(v)) for k, v in _MEM_TABLE)
+_NONE_RESPONSE = _completion_bytes("NONE")
+_ALLERGIC_REPLY = _completion_bytes("You are allergic to peanuts based on my memory.")
 
 @app.post("/v1/chat/completions")
-def chat_completions(req: ChatRequest):
-    messages = req.messages
+async def chat_completions(request: Request):
+    # Raw-body orjson parse: the mock only reads messages, so Pydantic model
+    # construction and validation per request is pure overhead here.
+    body = _loads(await request.body())
+    messages = body.get("messages") or []
     system_prompt = messages[0]["content"] if messages and messages[0]["role"] == "system" else ""
     user_msg = messages[-1]["content"] if messages and messages[-1]["role"] == "user" else ""
     
     # Check if this is the memory extraction call
     if "Extract ONLY stable, factual" in system_prompt:
-        if "sad" in user_msg.lower():
-            content = "NONE"
-        elif "allergic" in user_msg.lower():
-            content = '{"content": "User is allergic to peanuts.", "subject": "Health", "importance": 5}'
-        elif "buy a house" in user_msg.lower():
-            content = '{"content": "User wants to buy a new house.", "subject": "Finance", "importance": 4}'
-        elif "learn piano" in user_msg.lower():
-            content = '{"content": "User is learning piano.", "subject": "Hobbies", "importance": 2}'
-        elif "went to the gym" in user_msg.lower():
-            content = '{"content": "User went to the gym.", "subject": "Health", "importance": 3}'
-        elif "had a team meeting" in user_msg.lower():
-            content = '{"content": "User had a team meeting.", "subject": "Work", "importance": 4}'
-        elif "deployed to production" in user_msg.lower():
-            content = '{"content": "User deployed system to production.", "subject": "Work", "importance": 5}'
-        elif "played tennis" in user_msg.lower():
-            content = '{"content": "User played tennis.", "subject": "Health", "importance": 2}'
-        else:
-            content = "NONE"
-        return {
-            "choices": [
-                {
-                    "message": {
-                        "content": content
-                    }
-                }
-            ]
-        }
-    
+        low = user_msg.lower()
+        body = next((v for k, v in _MEM_RESPONSES if k in low), _NONE_RESPONSE)
+        return Response(content=body, media_type="application/json")
+
     # Main chat generation
     if "allergic to peanuts" in system_prompt:
-        reply = "You are allergic to peanuts based on my memory."
+        body = _ALLERGIC_REPLY
     else:
-        reply = f"I am a mock response to: {user_msg}"
-        
-    return {
-        "choices": [
-            {
-                "message": {
-                    "content": reply
-                }
-            }
-        ]
-    }
+        body = _completion_bytes(f"I am a mock response to: {user_msg}")
+
+    return Response(content=body, media_type="application/json")
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="127.0.0.1", port=1234)
+    import os
+    # Import string + workers: one process per core so the stress harness
+    # measures the memory/lock layer, not a single-process mock. loop/http
+    # stay on "auto", which upgrades to uvloop/httptools when installed
+    # without making them hard dependencies.
+    uvicorn.run("mock_server:app", host="127.0.0.1", port=1234,
+                workers=os.cpu_count(), log_level="warning")
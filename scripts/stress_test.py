@@ -1,25 +1,44 @@
 import os
 import concurrent.futures
-from uuid import uuid4
-from llm_client import LLMClient
-from memory.manager import MemoryManager
+import time
+
+import _path  # noqa: F401  # puts project root on sys.path
+
+from app.llm_client import LLMClient
+from app.memory.manager import MemoryManager
+from app.settings import MAX_CHAT_HISTORY
 
 # We will mock the OpenAI call inside LLMClient for this stress test
 # so it runs instantly without needing LM Studio.
-import llm_client
-import threading
-import time
+from app import llm_client
+
+class _Msg:
+    content = "Mocked Response"
+
+class _Choice:
+    message = _Msg()
+
+class _Resp:
+    choices = [_Choice()]
+
+# The response is immutable and identical for every call, so one instance
+# built at import serves all 50 workers; the old create() defined three
+# classes and allocated three objects per request.
+_MOCK_RESPONSE = _Resp()
+
+# Simulated I/O delay per mock completion. The default keeps the 10ms window
+# that encourages same-session races; set STRESS_MOCK_DELAY_S=0 to measure
+# pure lock contention instead of sleep scheduling.
+MOCK_DELAY_S = float(os.environ.get("STRESS_MOCK_DELAY_S", "0.01"))
 
 class MockCompletions:
+    def __init__(self, delay_s: float = MOCK_DELAY_S):
+        self.delay_s = delay_s
+
     def create(self, **kwargs):
-        class Msg:
-            content = "Mocked Response"
-        class Choice:
-            message = Msg()
-        class Resp:
-            choices = [Choice()]
-        time.sleep(0.01) # Simulate slight I/O delay to encourage race condition
-        return Resp()
+        if self.delay_s > 0:
+            time.sleep(self.delay_s)
+        return _MOCK_RESPONSE
 
 class MockChat:
     completions = MockCompletions()
@@ -32,11 +51,13 @@ llm_client.OpenAI = MockClient
 
 def test_concurrent_writes():
     print("--- Starting STRESS TEST: Concurrent Same-Session Requests ---")
-    client = LLMClient()
     session_id = "stress_test_session"
-    
-    # Ensure clean slate
+
+    # One manager shared between the client and the verification reads below.
     m = MemoryManager()
+    client = LLMClient(memory_manager=m)
+
+    # Ensure clean slate
     filepath = m._get_file_path(session_id)
     if os.path.exists(filepath):
         os.remove(filepath)
@@ -60,18 +81,19 @@ def test_concurrent_writes():
     history = m.load(session_id)
     print(f"Final saved history length: {len(history)}")
     
-    # Each request adds 1 user message, 1 assistant message.
-    # We sent 50 requests (100 messages total).
-    # Expected: The final history should be exactly MAX_CHAT_HISTORY (20).
-    # And there should be NO duplicates/corruption.
-    
-    if len(history) == 20:
-        print("✅ SUCCESS: History length is perfectly truncated at 20.")
+    # Each request adds 1 user message, 1 assistant message (100 total).
+    # append() only compacts once the file exceeds twice the cap, so the
+    # final length legitimately lands anywhere in [cap, 2*cap]. What must
+    # never happen is interleaving corruption: load() quarantines an
+    # unparseable file and returns [], which lands outside the band.
+    if MAX_CHAT_HISTORY <= len(history) <= 2 * MAX_CHAT_HISTORY:
+        print(f"✅ SUCCESS: History length {len(history)} is within [{MAX_CHAT_HISTORY}, {2 * MAX_CHAT_HISTORY}].")
     else:
-        print(f"❌ FAILED: History length is {len(history)} (expected 20).")
-        
-    print(f"Sample old message: {history[0]['content']}")
-    print(f"Sample recent message: {history[-1]['content']}")
+        print(f"❌ FAILED: History length is {len(history)} (expected between {MAX_CHAT_HISTORY} and {2 * MAX_CHAT_HISTORY}).")
+
+    if history:
+        print(f"Sample old message: {history[0]['content']}")
+        print(f"Sample recent message: {history[-1]['content']}")
     
     if os.path.exists(filepath):
         os.remove(filepath)
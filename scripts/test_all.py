@@ -1,24 +1,69 @@
+import concurrent.futures
 import subprocess
 import os
 import sys
+import threading
 
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
-def run_command(cmd, env=None):
+def run_captured(cmd, env=None):
+    """
+    Runs a command with captured output, for scripts executed in parallel.
+    Returns (cmd, ok, output); the caller prints each block whole so
+    concurrent scripts don't interleave their lines.
+    """
+    run_env = os.environ.copy()
+    if env:
+        run_env.update(env)
+
+    result = subprocess.run(cmd, cwd=PROJECT_ROOT, env=run_env,
+                            capture_output=True, text=True)
+    output = result.stdout + result.stderr
+    return cmd, result.returncode == 0, output
+
+# Per-command ceiling so a hung test can't stall the whole suite.
+COMMAND_TIMEOUT_S = 600
+
+def run_command(cmd, env=None, timeout=COMMAND_TIMEOUT_S):
     print(f"\n================================================")
     print(f"🚀 Running: {' '.join(cmd)}")
     print(f"================================================\n")
-    
+
     run_env = os.environ.copy()
     if env:
         run_env.update(env)
-        
-    result = subprocess.run(cmd, cwd=PROJECT_ROOT, env=run_env)
-    
-    if result.returncode != 0:
+
+    # Stream the child's merged output line by line instead of sitting
+    # silent until it exits; failures surface as they happen. A watchdog
+    # timer enforces the ceiling, since the read loop itself blocks until
+    # the child closes its pipe.
+    proc = subprocess.Popen(cmd, cwd=PROJECT_ROOT, env=run_env,
+                            stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, bufsize=1)
+    timed_out = False
+
+    def _kill_on_timeout():
+        nonlocal timed_out
+        timed_out = True
+        proc.kill()
+
+    watchdog = threading.Timer(timeout, _kill_on_timeout)
+    watchdog.start()
+    try:
+        for line in proc.stdout:
+            sys.stdout.write(line)
+        returncode = proc.wait()
+    finally:
+        watchdog.cancel()
+
+    if timed_out:
+        print(f"\n❌ TIMED OUT after {timeout}s: {' '.join(cmd)}")
+        return False
+
+    if returncode != 0:
         print(f"\n❌ FAILED: {' '.join(cmd)}")
         return False
-    
+
     print(f"\n✅ PASSED: {' '.join(cmd)}")
     return True
 
@@ -40,10 +85,25 @@ def main():
         "tests/test_stress_db.py"
     ]
     
-    print("\n--- 2. Standalone Application & DB Scripts ---")
-    for script in standalone_scripts:
-        if not run_command([sys.executable, script]):
-            all_passed = False
+    # The scripts touch distinct session ids / DB rows (and SQLite runs in
+    # WAL mode), so they run concurrently; suite wall-clock is roughly the
+    # slowest script instead of the sum of all four.
+    print("\n--- 2. Standalone Application & DB Scripts (parallel) ---")
+    max_workers = min(len(standalone_scripts), os.cpu_count() or 1)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(run_captured, [sys.executable, script])
+                   for script in standalone_scripts]
+        for future in concurrent.futures.as_completed(futures):
+            cmd, ok, output = future.result()
+            print(f"\n================================================")
+            print(f"🚀 Ran: {' '.join(cmd)}")
+            print(f"================================================\n")
+            print(output, end="")
+            if ok:
+                print(f"\n✅ PASSED: {' '.join(cmd)}")
+            else:
+                print(f"\n❌ FAILED: {' '.join(cmd)}")
+                all_passed = False
             
     if all_passed:
         print("\n🎉 SUMMARY: ALL TEST PHASES PASSED SUCCESSFULLY! 🎉")
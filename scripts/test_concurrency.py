@@ -1,13 +1,11 @@
 import sys
-from pathlib import Path
 import uuid
 import time
 import concurrent.futures
 import random
 import traceback
 
-# Add project root to sys.path
-sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+import _path  # noqa: F401  # puts project root on sys.path
 
 from app.memory.db import MemoryDB
 from app.memory.policy import PolicyEngine
@@ -1,9 +1,6 @@
 import sys
 import os
-from pathlib import Path
-
-# Add project root to sys.path
-sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+import _path  # noqa: F401  # puts project root on sys.path
 
 from mcp_adapter import read_file
 
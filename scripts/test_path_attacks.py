@@ -1,59 +1,59 @@
 import sys
 import os
-import threading
+import concurrent.futures
 import time
-from pathlib import Path
-
-sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+import _path  # noqa: F401  # puts project root on sys.path
 from mcp_adapter import read_file
 
-def test_attack(name, payload):
-    print(f"Testing Attack: {name}")
-    print(f"Payload: {payload}")
+def run_attack(payload):
+    """Issues one attack read; returns the content or the raised exception."""
     try:
-        content = read_file(payload)
-        if content.startswith("Error:"):
-            print(f"[PASS] Blocked with error string: {content}")
-            return True
-        print("[FAIL] Attack succeeded (path was read)!")
-        return False
+        return read_file(payload)
     except Exception as e:
-        print(f"[WARN] UNEXPECTED: {type(e).__name__}: {e}")
+        return e
+
+def test_attack(name, payload, outcome):
+    print(f"Testing Attack: {name}")
+    print(f"Payload: {payload}")
+    if isinstance(outcome, Exception):
+        print(f"[WARN] UNEXPECTED: {type(outcome).__name__}: {outcome}")
         return False
+    if outcome.startswith("Error:"):
+        print(f"[PASS] Blocked with error string: {outcome}")
+        return True
+    print("[FAIL] Attack succeeded (path was read)!")
+    return False
 
 def test_concurrency():
     print("\nTesting Concurrency (20 parallel reads)...")
-    successes = 0
-    failures = 0
-    lock = threading.Lock()
-    
+
+    # Each worker returns its own (verdict, elapsed) pair; no shared
+    # counters, so the timed section measures the parallel reads, not
+    # contention on a bookkeeping mutex every thread had to funnel through.
     def worker():
-        nonlocal successes, failures
+        t0 = time.perf_counter()
         try:
             content = read_file("requirements.txt")
-            if "fastapi" in content.lower():
-                with lock:
-                    successes += 1
-            else:
-                with lock:
-                    failures += 1
+            ok = "fastapi" in content.lower()
         except Exception as e:
             print(f"Concurrent thread failed: {e}")
-            with lock:
-                failures += 1
-                
-    threads = []
+            ok = False
+        return ok, time.perf_counter() - t0
+
     start_time = time.time()
-    for _ in range(20):
-        t = threading.Thread(target=worker)
-        threads.append(t)
-        t.start()
-        
-    for t in threads:
-        t.join()
-        
+    # Pool threads are reused across the 20 reads instead of paying a fresh
+    # thread spawn per read.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=20) as executor:
+        results = list(executor.map(lambda _: worker(), range(20)))
+
     duration = time.time() - start_time
+    successes = sum(ok for ok, _ in results)
+    failures = len(results) - successes
+    # Per-worker spread exposes stragglers that the wall-clock total hides
+    # (one slow read under contention vs. all reads uniformly slow).
+    elapsed = [t for _, t in results]
     print(f"Concurrency results: {successes} passed, {failures} failed in {duration:.3f}s")
+    print(f"Per-read latency: min {min(elapsed)*1000:.1f}ms, max {max(elapsed)*1000:.1f}ms")
     return failures == 0
 
 if __name__ == "__main__":
@@ -68,9 +68,14 @@ if __name__ == "__main__":
         ("Absolute Posix Inner", "/frontend/index.html")
     ]
     
+    # The reads are I/O-bound and independent, so they're issued as one
+    # parallel batch; classification (and its ordered output) stays serial.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(attacks)) as executor:
+        outcomes = list(executor.map(run_attack, (payload for _, payload in attacks)))
+
     attack_failures = 0
-    for name, payload in attacks:
-        if not test_attack(name, payload):
+    for (name, payload), outcome in zip(attacks, outcomes):
+        if not test_attack(name, payload, outcome):
             attack_failures += 1
             
     if attack_failures > 0:
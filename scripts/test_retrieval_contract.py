@@ -1,22 +1,18 @@
-import sys
-from pathlib import Path
-import uuid
-import time
-
-# Add project root to sys.path
-sys.path.insert(0, str(Path(__file__).parent.parent.resolve()))
+import _path  # noqa: F401  # puts project root on sys.path
 
 from app.memory.db import MemoryDB
 from app.memory.policy import PolicyEngine
+# Shared run-unique id helper (one uuid4 run token per process + counter).
+from tests._bootstrap import uid
 
 def test_retrieval_contract():
     db = MemoryDB(init_db=True)
     policy = PolicyEngine(db)
     
     session_id = "test_session"
-    user_a = f"user_A_{uuid.uuid4().hex[:8]}"
-    user_b = f"user_B_{uuid.uuid4().hex[:8]}"
-    subject = f"TestSubj_{uuid.uuid4().hex[:8]}"
+    user_a = f"user_A_{uid()}"
+    user_b = f"user_B_{uid()}"
+    subject = f"TestSubj_{uid()}"
     
     print(f"--- Testing Retrieval Contract ---")
 
@@ -36,15 +32,25 @@ def test_retrieval_contract():
 
     # 2. Deterministic Ranking (Priority -> Confidence -> Recency)
     print("\n2. Testing Deterministic Ranking...")
-    user_c = f"user_C_{uuid.uuid4().hex[:8]}"
-    subj_rank = f"Rank_{uuid.uuid4().hex[:8]}"
+    user_c = f"user_C_{uid()}"
+    subj_rank = f"Rank_{uid()}"
     
-    # Insert multiple facts for same subject but different content (no 60% overlap so they don't supersede)
-    policy.evaluate_and_store(session_id, "Apple", "2026-02-27", subj_rank, 3, user_c, confidence_score=0.6, source="inferred")
-    policy.evaluate_and_store(session_id, "Banana", "2026-02-27", subj_rank, 3, user_c, confidence_score=0.8, source="inferred")
-    policy.evaluate_and_store(session_id, "Cherry", "2026-02-27", subj_rank, 3, user_c, confidence_score=1.0, source="imported")
-    policy.evaluate_and_store(session_id, "Date", "2026-02-27", subj_rank, 3, user_c, confidence_score=1.0, source="manual")
-    policy.evaluate_and_store(session_id, "Elderberry", "2026-02-27", subj_rank, 3, user_c, confidence_score=0.9, source="manual")
+    # Insert multiple facts for same subject but different content (no 60% overlap
+    # so they don't supersede). Since nothing conflicts, the fixture skips the
+    # policy path entirely and lands in one bulk transaction; the test exercises
+    # retrieval ranking, not storage evaluation.
+    db.insert_memories_bulk([
+        {"session_id": session_id, "content": content, "memory_date": "2026-02-27",
+         "subject": subj_rank, "importance": 3, "user_id": user_c,
+         "confidence_score": confidence, "source": source}
+        for content, confidence, source in [
+            ("Apple", 0.6, "inferred"),
+            ("Banana", 0.8, "inferred"),
+            ("Cherry", 1.0, "imported"),
+            ("Date", 1.0, "manual"),
+            ("Elderberry", 0.9, "manual"),
+        ]
+    ])
     
     res_rank = policy.retrieve_memory(user_id=user_c, scope=[subj_rank])
     results = res_rank["results"]
@@ -66,8 +72,8 @@ def test_retrieval_contract():
 
     # 3. State Filtering (Superseded is hidden)
     print("\n3. Testing State Filtering (Hiding Superseded)...")
-    user_d = f"user_D_{uuid.uuid4().hex[:8]}"
-    subj_state = f"State_{uuid.uuid4().hex[:8]}"
+    user_d = f"user_D_{uid()}"
+    subj_state = f"State_{uid()}"
     
     # Store inferred, then supersede it with manual
     policy.evaluate_and_store(session_id, "I like dogs", "2026-02-27", subj_state, 3, user_d, confidence_score=0.6, source="inferred")
@@ -90,9 +96,23 @@ def test_retrieval_contract():
     # Total available is 5, but let's test the cap logic. If there were 25, it would cap at 20.
     # We will simulate the DB check directly or just know the limit parameter didn't crash.
     # To truly test the cap, we'd insert 25. Let's insert 21 for user E.
-    user_e = f"user_E_{uuid.uuid4().hex[:8]}"
-    for i in range(25):
-        policy.evaluate_and_store(session_id, f"Fact {i}", "2026-02-27", "Spam", 3, user_e, confidence_score=0.5, source="inferred")
+    user_e = f"user_E_{uid()}"
+    # The 25 facts are fixture data with no mutual overlap, so they go in as
+    # one bulk transaction (one commit) instead of 25 policy evaluations
+    # each paying its own conflict scan and fsync.
+    db.insert_memories_bulk([
+        {
+            "session_id": session_id,
+            "content": f"Fact {i}",
+            "memory_date": "2026-02-27",
+            "subject": "Spam",
+            "importance": 3,
+            "user_id": user_e,
+            "confidence_score": 0.5,
+            "source": "inferred",
+        }
+        for i in range(25)
+    ])
     
     res_cap = policy.retrieve_memory(user_id=user_e, scope=["Spam"], limit=50)
     assert len(res_cap["results"]) == 20
@@ -100,7 +120,7 @@ def test_retrieval_contract():
 
     # 5. Rate Limiting
     print("\n5. Testing Rate Limiting (50 per minute)...")
-    user_f = f"user_F_{uuid.uuid4().hex[:8]}"
+    user_f = f"user_F_{uid()}"
     # 50 allowed
     for _ in range(50):
         res = policy.retrieve_memory(user_id=user_f)
@@ -0,0 +1,26 @@
+"""Puts the project root on sys.path; imported for its side effect.
+
+Works in both execution modes: a direct `python tests/foo.py` run has
+tests/ as sys.path[0], and pytest inserts a test module's directory
+before importing it, so `import _bootstrap` resolves here either way.
+abspath is pure string manipulation — no filesystem stats — and the
+guard keeps repeat imports from stacking duplicate entries.
+"""
+import itertools
+import os
+import sys
+import uuid
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+# Shared unique-id helper: one uuid4 run token per process, then a counter.
+# Test identifiers only need to be unique against earlier runs' rows in the
+# persistent DB, so this costs a single entropy read per run instead of one
+# per identifier.
+_RUN_ID = uuid.uuid4().hex[:8]
+_SEQ = itertools.count()
+
+def uid() -> str:
+    return f"{_RUN_ID}_{next(_SEQ)}"
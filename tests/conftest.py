@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+
+# Project root on sys.path once per session, before any test module
+# imports app. Test modules keep their own one-line prelude because
+# test_all.py also runs several of them directly with `python tests/...`,
+# where conftest never loads; under pytest this line simply wins first.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Give each pytest-xdist worker its own database directory. Every test
+# module otherwise shares the hardcoded data/database/memory.db, so a
+# parallel run (pytest -n auto) would serialize all workers on one SQLite
+# write lock. DAFTAR_DB_DIR is read by app.memory.db at import time, which
+# is why this runs here (conftest loads before any test module imports the
+# app) rather than in a fixture. Plain runs are unaffected: the variable is
+# only set when xdist is driving, and an explicit DAFTAR_DB_DIR wins.
+_worker = os.environ.get("PYTEST_XDIST_WORKER")
+if _worker and "DAFTAR_DB_DIR" not in os.environ:
+    os.environ["DAFTAR_DB_DIR"] = os.path.join(
+        tempfile.gettempdir(), f"daftar_test_{_worker}"
+    )
@@ -1,46 +1,50 @@
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import _bootstrap  # noqa: F401  # puts project root on sys.path
 from fastapi.testclient import TestClient
 from app.main import app
 
 client = TestClient(app)
 from app.memory.db import MemoryDB
-from datetime import datetime
+from datetime import date
 
 from app.llm_client import LLMClient
 
 API_URL = "http://127.0.0.1:8000/chat"
 
+# Computed once at import; isoformat() is the same string strftime built
+# character by character from a format spec.
+TODAY = date.today().isoformat()
+
 def test_auth_and_isolation():
     print("--- Phase 7: Authentication and Isolation Tests ---")
 
-    # 1. Test missing token
-    print("1. Testing missing token...")
-    resp = client.post("/chat", json={"message": "Hello"})
-    assert resp.status_code == 401, f"Expected 401, got {resp.status_code}"
-    data = resp.json()
-    assert data["error"] == "Unauthorized"
+    # One client context for both 401 probes: app lifespan runs once for
+    # the block instead of being entered and torn down per request.
+    with client:
+        # 1. Test missing token
+        print("1. Testing missing token...")
+        resp = client.post("/chat", json={"message": "Hello"})
+        assert resp.status_code == 401, f"Expected 401, got {resp.status_code}"
+        data = resp.json()
+        assert data["error"] == "Unauthorized"
 
-    # 2. Test invalid token
-    print("2. Testing invalid token...")
-    resp = client.post(
-        "/chat", 
-        json={"message": "Hello"}, 
-        headers={"Authorization": "Bearer not-a-real-token"}
-    )
-    assert resp.status_code == 401, f"Expected 401, got {resp.status_code}"
+        # 2. Test invalid token
+        print("2. Testing invalid token...")
+        resp = client.post(
+            "/chat",
+            json={"message": "Hello"},
+            headers={"Authorization": "Bearer not-a-real-token"}
+        )
+        assert resp.status_code == 401, f"Expected 401, got {resp.status_code}"
     
     # Set up DB for isolation test
     print("3. Setting up mock memories for cross-user isolation...")
     db = MemoryDB()
-    today = datetime.now().strftime("%Y-%m-%d")
     
     # Insert private memory for user_1
     db.store_memory(
         session_id="test_session_u1",
         content="User 1 secret project",
-        memory_date=today,
+        memory_date=TODAY,
         subject="Work",
         importance=5,
         user_id="user_1",
@@ -51,7 +55,7 @@ def test_auth_and_isolation():
     db.store_memory(
         session_id="test_session_admin",
         content="Admin secret master plan",
-        memory_date=today,
+        memory_date=TODAY,
         subject="Work",
         importance=5,
         user_id="admin_1",
@@ -82,7 +86,7 @@ def test_auth_and_isolation():
     db.store_memory(
         session_id="test_session_shared",
         content="Company wide announcement",
-        memory_date=today,
+        memory_date=TODAY,
         subject="Work",
         importance=3,
         user_id="admin_1",
@@ -102,7 +106,7 @@ def test_auth_and_isolation():
     db.store_memory(
         session_id="test_session_shared_health",
         content="Health tip for everyone",
-        memory_date=today,
+        memory_date=TODAY,
         subject="Health",
         importance=3,
         user_id="admin_1",
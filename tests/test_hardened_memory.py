@@ -1,6 +1,4 @@
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import _bootstrap  # noqa: F401  # puts project root on sys.path
 
 from unittest.mock import patch, MagicMock
 from app.memory.db import MemoryDB
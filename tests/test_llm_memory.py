@@ -1,56 +1,69 @@
-import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import _bootstrap  # noqa: F401  # puts project root on sys.path
 
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 from app.memory.db import MemoryDB
 from app.memory.manager import MemoryManager
 from app.llm_client import LLMClient
 
+def _mkresp(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+class _StubOpenAI:
+    """
+    Plain stub standing in for the OpenAI client. MagicMock pays a tracked
+    attribute lookup (and allocates child mocks) on every
+    .choices[0].message.content walk; here each access is a normal attribute.
+    The response content is swapped per sub-case via the class attribute.
+    """
+    content = ""
+
+    def __init__(self, **kwargs):
+        self.chat = SimpleNamespace(
+            completions=SimpleNamespace(create=lambda **kw: _mkresp(_StubOpenAI.content))
+        )
+
+# Table of extraction sub-cases: (message, raw model output, expected fields
+# or None when the payload must be rejected, success line).
+CASES = [
+    ("I love pytest",
+     '```json\n{"content": "User loves pytest.", "subject": "Tech", "importance": 4}\n```',
+     {"content": "User loves pytest.", "subject": "Tech", "importance": 4},
+     "✅ Normal extraction parsed safely."),
+    ("I love pytest",
+     '{"content": "Missing subject."}',
+     None,
+     "✅ Missing keys properly rejected."),
+    ("Wow",
+     '{"content": "Super!", "subject": "Tech", "importance": 10}',
+     {"importance": 5},
+     "✅ Importance >5 clamped to 5."),
+    ("Wow",
+     '{"content": "Low!", "subject": "Tech", "importance": -2}',
+     {"importance": 1},
+     "✅ Importance <1 clamped to 1."),
+    ("Wow",
+     '{"content": "Default importance.", "subject": "Tech"}',
+     {"importance": 3},
+     "✅ Missing importance defaults to 3."),
+]
+
 def test_extraction():
     client = LLMClient()
-    
-    # 1. Normal valid case
-    mock_response = MagicMock()
-    mock_response.choices[0].message.content = '```json\n{"content": "User loves pytest.", "subject": "Tech", "importance": 4}\n```'
-    
-    with patch('app.llm_client.OpenAI') as MockOpenAI:
-        mock_instance = MockOpenAI.return_value
-        mock_instance.chat.completions.create.return_value = mock_response
-        
-        res = client._extract_memory_sync("I love pytest", "http://fake")
-        assert res is not None, "Expected valid memory"
-        assert res["content"] == "User loves pytest.", f"Got {res['content']}"
-        assert res["subject"] == "Tech"
-        assert res["importance"] == 4
-        print("✅ Normal extraction parsed safely.")
-
-        # 2. Missing key validation (no subject)
-        mock_response.choices[0].message.content = '{"content": "Missing subject."}'
-        res2 = client._extract_memory_sync("I love pytest", "http://fake")
-        assert res2 is None, "Should reject if missing keys"
-        print("✅ Missing keys properly rejected.")
-        
-        # 3. Test importance clamp (10 -> 5)
-        mock_response.choices[0].message.content = '{"content": "Super!", "subject": "Tech", "importance": 10}'
-        res3 = client._extract_memory_sync("Wow", "http://fake")
-        assert res3 is not None
-        assert res3["importance"] == 5, f"Expected 5, got {res3['importance']}"
-        print("✅ Importance >5 clamped to 5.")
-        
-        # 4. Test importance clamp (-2 -> 1)
-        mock_response.choices[0].message.content = '{"content": "Low!", "subject": "Tech", "importance": -2}'
-        res4 = client._extract_memory_sync("Wow", "http://fake")
-        assert res4 is not None
-        assert res4["importance"] == 1, f"Expected 1, got {res4['importance']}"
-        print("✅ Importance <1 clamped to 1.")
-
-        # 5. Missing importance defaults to 3
-        mock_response.choices[0].message.content = '{"content": "Default importance.", "subject": "Tech"}'
-        res5 = client._extract_memory_sync("Wow", "http://fake")
-        assert res5 is not None
-        assert res5["importance"] == 3, f"Expected 3, got {res5['importance']}"
-        print("✅ Missing importance defaults to 3.")
+
+    # One patch context and one stub instance serve every sub-case; only the
+    # stubbed response content changes between iterations.
+    with patch('app.llm_client.OpenAI', _StubOpenAI):
+        for message, payload, expected, success_msg in CASES:
+            _StubOpenAI.content = payload
+            res = client._extract_memory_sync(message, "http://fake")
+            if expected is None:
+                assert res is None, f"Should reject payload: {payload}"
+            else:
+                assert res is not None, f"Expected valid memory for: {payload}"
+                for key, value in expected.items():
+                    assert res[key] == value, f"Expected {key}={value}, got {res[key]}"
+            print(success_msg)
 
 if __name__ == "__main__":
     try:
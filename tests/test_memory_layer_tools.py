@@ -1,32 +1,44 @@
-import os
-import sys
+import json
 import pytest
 
 # Add standard import path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import _bootstrap  # noqa: F401  # puts project root on sys.path
 
+from app.memory import db as memory_db
 from app.memory.db import MemoryDB
 from app.tools.memory import MemoryTool
 
-@pytest.fixture
-def db():
-    # Force an empty, new temporary database for isolated testing
-    # But wait, MemoryDB is hardcoded to data/database/memory.db right now.
-    # I should use it, but clear settings for tests.
-    db_inst = MemoryDB(init_db=True)
-    # Clear settings initially
-    with db_inst._get_connection() as conn:
-        conn.execute("DELETE FROM settings_overrides")
-        conn.execute("DELETE FROM memories")
-        conn.execute("DELETE FROM memory_versions")
-        conn.commit()
-    yield db_inst
-    # Teardown
+# Serialized once; several tests set the same allowed_subjects override.
+_ALLOW_ALL = json.dumps(["*"])
+_ALLOW_WORK = json.dumps(["Work"])
+
+# One MemoryDB (and its schema init) for the whole module; per-test isolation
+# comes from the wipe below, not from rebuilding the instance each time.
+# MemoryDB is hardcoded to data/database/memory.db, so we use it but clear it.
+@pytest.fixture(scope="module")
+def _db_instance():
+    return MemoryDB(init_db=True)
+
+def _wipe(db_inst):
+    # One script, one transaction: all three deletes share a single commit.
     with db_inst._get_connection() as conn:
-        conn.execute("DELETE FROM settings_overrides")
-        conn.execute("DELETE FROM memories")
-        conn.execute("DELETE FROM memory_versions")
-        conn.commit()
+        conn.executescript("""
+            BEGIN IMMEDIATE;
+            DELETE FROM settings_overrides;
+            DELETE FROM memories;
+            DELETE FROM memory_versions;
+            COMMIT;
+        """)
+    # The raw deletes above bypass the write paths, so the snapshot caches
+    # (overrides and active-memory) still hold the wiped rows; drop them.
+    memory_db.invalidate_overrides_cache()
+    memory_db._active_cache_invalidate()
+
+@pytest.fixture
+def db(_db_instance):
+    _wipe(_db_instance)
+    yield _db_instance
+    _wipe(_db_instance)
 
 @pytest.fixture
 def tool(db):
@@ -80,7 +92,6 @@ def test_threshold_boundary(tool, db):
 
 def test_subject_filtering_rejected(tool, db):
     """Test subject filtering -> rejected"""
-    import json
     db.set_setting_override("allowed_subjects", json.dumps(["Work", "Health"]))
     
     result = tool.store_memory(
@@ -95,8 +106,7 @@ def test_subject_filtering_rejected(tool, db):
 
 def test_case_normalization_for_subject(tool, db):
     """Test case normalization and whitespace stripping for subject"""
-    import json
-    db.set_setting_override("allowed_subjects", json.dumps(["Work"])) # Note capitalized W
+    db.set_setting_override("allowed_subjects", _ALLOW_WORK) # Note capitalized W
     
     result = tool.store_memory(
         content="Started new coding project",
@@ -115,8 +125,7 @@ def test_case_normalization_for_subject(tool, db):
 
 def test_wildcard_subject(tool, db):
     """Test wildcard subject '*' allows any"""
-    import json
-    db.set_setting_override("allowed_subjects", json.dumps(["*"]))
+    db.set_setting_override("allowed_subjects", _ALLOW_ALL)
     
     result = tool.store_memory(
         content="Wildcard tests",
@@ -156,14 +165,13 @@ def test_malformed_settings(tool, db):
 
 def test_daily_summary_filtering(tool, db):
     """Test get_daily_summary correctly applies filters"""
-    import json
-    db.set_setting_override("allowed_subjects", json.dumps(["*"]))
+    db.set_setting_override("allowed_subjects", _ALLOW_ALL)
     
     tool.store_memory("Work task 1", "2026-02-23", "Work", 4, "sess1")
     tool.store_memory("Health issue", "2026-02-23", "Health", 5, "sess1")
     
     # Now restrict subjects to only Work
-    db.set_setting_override("allowed_subjects", json.dumps(["Work"]))
+    db.set_setting_override("allowed_subjects", _ALLOW_WORK)
     
     summary_resp = tool.get_daily_summary("2026-02-23", "sess1")
     assert summary_resp["status"] == "success"
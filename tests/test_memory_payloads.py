@@ -0,0 +1,50 @@
+import pytest
+
+# Add standard import path (and the shared run-unique id helper)
+from _bootstrap import uid
+
+from app.memory.db import MemoryDB
+from app.tools.memory import MemoryTool
+
+# One MemoryDB/MemoryTool pair for the whole module; the tests use unique
+# subjects and contents, so they don't need per-test wipes.
+@pytest.fixture(scope="module")
+def tool():
+    return MemoryTool(db_instance=MemoryDB(init_db=True))
+
+# Stored once, shared by the success-payload and duplicate-payload tests
+# (the duplicate test re-submits exactly this fact).
+@pytest.fixture(scope="module")
+def stored_fact(tool):
+    subject = f"Pref_{uid()}"
+    content = f"User loves Python for backend development {uid()}"
+    result = tool.store_memory(content, "2026-02-27", subject, 5)
+    return subject, content, result
+
+def test_invalid_date_payload(tool):
+    res = tool.store_memory("content", "invalid-date", "General", 4)
+    assert res.get("notification") == "⚠️ Memory not saved (invalid date)"
+    assert res.get("stored") is False
+
+def test_below_threshold_payload(tool):
+    # by default threshold is 3.0
+    res = tool.store_memory("trivial", "2026-02-27", "General", 1)
+    assert res.get("notification") == "⚠️ Memory not saved (below threshold)"
+    assert res.get("stored") is False
+
+def test_success_payload_structure(stored_fact):
+    subject, _, res = stored_fact
+    assert res.get("notification") in ["🧠 Saved to memory", "🧠 Memory updated"]
+    assert res.get("stored") is True
+    assert res.get("memory_type") == subject.lower()
+
+def test_duplicate_memory_payload(tool, stored_fact):
+    subject, content, _ = stored_fact
+    res = tool.store_memory(content, "2026-02-27", subject, 5)
+    assert res.get("status") == "exists"
+    assert res.get("notification") == "✅ Memory already exists"
+    assert res.get("stored") is False
+    assert res.get("reason_code", "").startswith("EXISTS_REASON")
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
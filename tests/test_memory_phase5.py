@@ -1,7 +1,5 @@
-import os
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from datetime import datetime
+import _bootstrap  # noqa: F401  # puts project root on sys.path
+from datetime import date
 from app.memory.db import MemoryDB
 
 def test_daily_aggregation():
@@ -9,7 +7,7 @@ def test_daily_aggregation():
     
     db = MemoryDB()
     session_id = "test_daily_agg_session"
-    today = datetime.now().strftime("%Y-%m-%d")
+    today = date.today().isoformat()
     
     # 1. Store memories with various importances
     db.store_memory(session_id=session_id, content="User played tennis", memory_date=today, subject="Health", importance=2)
@@ -1,7 +1,6 @@
 import os
 import json
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import _bootstrap  # noqa: F401  # puts project root on sys.path
 from app.memory.manager import MemoryManager
 
 print('--- Starting MemoryManager Tests ---')
@@ -0,0 +1,64 @@
+import pytest
+
+# Add standard import path (and the shared run-unique id helper)
+from _bootstrap import uid
+
+from app.memory.db import MemoryDB
+from app.memory.policy import PolicyEngine
+
+SESSION_ID = "test_session"
+USER_ID = "test_user"
+
+# The precedence cases are deliberately ordered and stateful: they all hit
+# the same subject, and each case exercises the policy's verdict against
+# whatever fact the previous case left active. On case 2: with equal
+# priority AND equal confidence the rule `confidence < existing` is False,
+# so an overlapping same-confidence fact DOES supersede.
+PRECEDENCE_CASES = [
+    ("initial_inferred_accepted",
+     "User prefers Python for scripts", 3, 0.6, "inferred",
+     "success", "ACCEPT_REASON_NEW_FACT"),
+    ("same_confidence_overlap_supersedes",
+     "User prefers Python for all backend scripts", 4, 0.6, "inferred",
+     "success", "SUPERSEDE_REASON_CONTENT_OVERLAP"),
+    ("lower_confidence_rejected",
+     "User prefers Python for all scripts and backend", 3, 0.4, "inferred",
+     "rejected", "REJECT_REASON_PRECEDENCE_TOO_LOW"),
+    ("manual_supersedes_inferred",
+     "User absolutely prefers Python", 5, 1.0, "manual",
+     "success", "SUPERSEDE_REASON_CONTENT_OVERLAP"),
+    ("inferred_rejected_against_manual",
+     "User prefers Python and Rust", 4, 0.8, "inferred",
+     "rejected", "REJECT_REASON_PRECEDENCE_TOO_LOW"),
+]
+
+@pytest.fixture(scope="module")
+def policy():
+    return PolicyEngine(MemoryDB(init_db=True))
+
+@pytest.fixture(scope="module")
+def subject():
+    return f"Test_{uid()}"
+
+@pytest.mark.parametrize(
+    "label,content,importance,confidence,source,exp_status,exp_reason",
+    PRECEDENCE_CASES,
+    ids=[case[0] for case in PRECEDENCE_CASES],
+)
+def test_precedence(policy, subject, label, content, importance, confidence,
+                    source, exp_status, exp_reason):
+    res = policy.evaluate_and_store(
+        session_id=SESSION_ID,
+        content=content,
+        memory_date="2026-02-27",
+        subject=subject,
+        importance=importance,
+        user_id=USER_ID,
+        confidence_score=confidence,
+        source=source,
+    )
+    assert res["status"] == exp_status, f"{label} failed: {res}"
+    assert res["reason_code"] == exp_reason
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])